@@ -16,3 +16,12 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     WORLD_SEED = 42
+
+    # Web workers share one cache when this points at a Redis server, e.g.
+    # redis://localhost:6379/0. Otherwise each worker keeps its own.
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+    CACHE_TYPE = "RedisCache" if CACHE_REDIS_URL else "SimpleCache"
+    # Passed to the connection pool behind the single Redis client each
+    # worker creates, which every request reuses.
+    CACHE_OPTIONS = {"max_connections": 64} if CACHE_REDIS_URL else {}
+    CACHE_DEFAULT_TIMEOUT = 300
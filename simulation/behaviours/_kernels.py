@@ -0,0 +1,118 @@
+"""
+Compiled inner loops shared by the behaviour modules.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def food_targets(food: np.ndarray, min_amount: float) -> Tuple[int, int, int, int]:
+    """
+    Scans a square window of food amounts centred on the critter, skipping
+    the centre tile, and returns (row, col) of both the richest tile and the
+    closest tile with more than `min_amount` food. Ties go to the first tile
+    in row-major order. Returns -1s if there is no such tile.
+    """
+    radius = food.shape[0] // 2
+
+    richest_row, richest_col = -1, -1
+    richest_amount = 0.0
+    closest_row, closest_col = -1, -1
+    closest_distance = 0
+
+    for row in range(food.shape[0]):
+        for col in range(food.shape[1]):
+            if row == radius and col == radius:
+                continue
+
+            amount = food[row, col]
+            if amount <= min_amount:
+                continue
+
+            if richest_row < 0 or amount > richest_amount:
+                richest_row, richest_col = row, col
+                richest_amount = amount
+
+            distance = abs(row - radius) + abs(col - radius)
+            if closest_row < 0 or distance < closest_distance:
+                closest_row, closest_col = row, col
+                closest_distance = distance
+
+    return richest_row, richest_col, closest_row, closest_col
+
+
+def make_scan_prey(
+    max_energy: float,
+    health_weight: float,
+    energy_weight: float,
+    distraction_bonus: float,
+):
+    """
+    Returns a compiled prey scan with the scoring constants baked in, so
+    they are folded into the loop rather than passed on every call.
+    """
+
+    @njit(cache=True)
+    def scan_prey(
+        xs: np.ndarray,
+        ys: np.ndarray,
+        is_prey: np.ndarray,
+        health: np.ndarray,
+        max_health: np.ndarray,
+        energy: np.ndarray,
+        distracted: np.ndarray,
+        cx: int,
+        cy: int,
+        perception: float,
+        ambush_radius: float,
+    ) -> Tuple[int, int, bool, int]:
+        """
+        Makes a single pass over the critters flagged by `is_prey` and returns
+        (adjacent, hunt_target, prey_in_ambush_range, ambush_target).
+
+        `adjacent` is the first prey next to (cx, cy); if there is one the scan
+        stops early and the other results are unset. Otherwise the targets are
+        the prey with the highest vulnerability score above -1 within
+        `perception` and `ambush_radius` (Chebyshev) respectively. Ties go to
+        the lowest index and missing critters are -1.
+        """
+        hunt_target, ambush_target = -1, -1
+        hunt_score, ambush_score = -1.0, -1.0
+        prey_in_ambush_range = False
+
+        for i in range(xs.shape[0]):
+            if not is_prey[i]:
+                continue
+
+            abs_dx = abs(xs[i] - cx)
+            abs_dy = abs(ys[i] - cy)
+            # For non-negative ints, (a | b) <= 1 iff both are at most 1.
+            if (abs_dx | abs_dy) <= 1:
+                return i, -1, False, -1
+
+            distance = max(abs_dx, abs_dy)
+            in_hunt_range = distance <= perception
+            in_ambush_range = distance <= ambush_radius
+            if not (in_hunt_range or in_ambush_range):
+                continue
+
+            health_score = (max_health[i] / (health[i] + 1)) * health_weight
+            energy_score = (max_energy / (energy[i] + 1)) * energy_weight
+            bonus = distraction_bonus if distracted[i] else 0.0
+            score = (health_score + energy_score + bonus) - (abs_dx + abs_dy) / perception
+
+            if in_hunt_range and score > hunt_score:
+                hunt_score = score
+                hunt_target = i
+            if in_ambush_range:
+                prey_in_ambush_range = True
+                if score > ambush_score:
+                    ambush_score = score
+                    ambush_target = i
+
+        return -1, hunt_target, prey_in_ambush_range, ambush_target
+
+    return scan_prey
@@ -7,7 +7,8 @@ from simulation.models import Critter
 from simulation.world import World
 
 
-@dataclass
+# One of these is built per critter per tick; slots keep them small.
+@dataclass(frozen=True, slots=True)
 class AIAction:
     type: ActionType.MOVE
     dx: Optional[float] = None
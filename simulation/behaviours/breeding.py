@@ -69,3 +69,7 @@ class BreedingBehavior(Behavior):
                     dy=next_step[1] - critter.y,
                     target=end_pos,
                 )
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = BreedingBehavior()
@@ -89,3 +89,7 @@ class FleeingBehavior(Behavior):
 
         # If no predators are nearby, return None.
         return None
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = FleeingBehavior()
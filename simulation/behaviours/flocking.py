@@ -2,7 +2,7 @@ from typing import Any, Dict, List, Optional
 from simulation.action_type import ActionType
 from simulation.behaviours.behavior import AIAction
 from simulation.behaviours.moving import MovingBehavior
-from simulation.behaviours.wandering import WanderingBehavior
+from simulation.behaviours import wandering
 from simulation.models import AIState, Critter, DietType
 from simulation.world import World
 
@@ -32,7 +32,7 @@ class FlockingBehavior(MovingBehavior):
 
         if not flockmates:
             # No mates nearby, use the standard wandering behaviour.
-            return WanderingBehavior().get_action(critter, world, all_critters)
+            return wandering.INSTANCE.get_action(critter, world, all_critters)
 
         num_flockmates = len(flockmates)
 
@@ -80,3 +80,7 @@ class FlockingBehavior(MovingBehavior):
         )
 
         return AIAction(type=ActionType.MOVE, dx=final_dx, dy=final_dy)
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = FlockingBehavior()
@@ -1,5 +1,7 @@
 import random
 from typing import Any, Dict, Optional
+
+from simulation.behaviours._kernels import food_targets
 from simulation.behaviours.behavior import AIAction
 from simulation.behaviours.foraging import ForagingBehavior
 from simulation.brain import SENSE_RADIUS, ActionType
@@ -34,32 +36,28 @@ class GrazingBehavior(ForagingBehavior):
             return AIAction(type=ActionType.EAT)
 
         # 2. If not on a food tile, scan the wider area to move towards.
-        scan_range = range(-SENSE_RADIUS, SENSE_RADIUS + 1)
-        surroundings = [
-            world.get_tile(critter.x + sx, critter.y + sy)
-            for sy in scan_range
-            for sx in scan_range
-            if not (sx == 0 and sy == 0)
-        ]
+        min_x, min_y = critter.x - SENSE_RADIUS, critter.y - SENSE_RADIUS
+        window = 2 * SENSE_RADIUS + 1
+        _, terrain = world.get_tile_slab(min_x, min_y, window, window)
+        food = world.get_food_slab(min_x, min_y, terrain)
 
-        food_tiles = [
-            tile for tile in surroundings if tile.food_available > MINIMUM_GRAZE_AMOUNT
-        ]
+        richest_row, richest_col, closest_row, closest_col = food_targets(
+            food, MINIMUM_GRAZE_AMOUNT)
 
-        if food_tiles:
+        if richest_row >= 0:
             # Choose a foraging strategy (unchanged)
             if random.random() < STRATEGIST_PROBABILITY:
                 # Strategist: go for the most food
-                best_tile = max(food_tiles, key=lambda tile: tile.food_available)
+                row, col = richest_row, richest_col
             else:
                 # Opportunist: go for the closest food
-                best_tile = min(
-                    food_tiles,
-                    key=lambda tile: abs(tile.x - critter.x) + abs(tile.y - critter.y),
-                )
+                row, col = closest_row, closest_col
 
             # Find a path to the tile
-            end_pos = (best_tile.x, best_tile.y)
+            end_pos = (
+                critter.x + col - SENSE_RADIUS,
+                critter.y + row - SENSE_RADIUS,
+            )
             path = find_path(world, (critter.x, critter.y), end_pos)
 
             if path and len(path) > 1:
@@ -75,3 +73,7 @@ class GrazingBehavior(ForagingBehavior):
 
         # 3. If no action can be taken, return None.
         return None
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = GrazingBehavior()
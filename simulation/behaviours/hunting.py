@@ -1,4 +1,7 @@
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from simulation.behaviours._kernels import make_scan_prey
 from simulation.behaviours.behavior import AIAction
 from simulation.behaviours.foraging import ForagingBehavior
 from simulation.brain import (
@@ -9,8 +12,14 @@ from simulation.brain import (
     MAX_ENERGY,
     ActionType,
 )
-from simulation.models import AIState, Critter, DietType
+from simulation.critter_batch import (
+    DISTRACTED_STATES,
+    CritterBatch,
+    get_batch,
+)
+from simulation.models import Critter, DietType
 from simulation.pathfinding import find_path
+from simulation.spatial_index import get_index
 from simulation.world import World
 
 # A multiplier that affects how far a carnivore is willing to chase based on its energy.
@@ -23,37 +32,111 @@ ENERGY_VULNERABILITY_WEIGHT = 1.0  # How much to prioritize low energy
 # A bonus for distracted (eating/drinking) prey
 DISTRACTION_VULNERABILITY_BONUS = 0.5
 
+_scan_prey = make_scan_prey(
+    MAX_ENERGY,
+    HEALTH_VULNERABILITY_WEIGHT,
+    ENERGY_VULNERABILITY_WEIGHT,
+    DISTRACTION_VULNERABILITY_BONUS,
+)
 
-class HuntingBehavior(ForagingBehavior):
-    def _find_best_target(self, critter: Critter, potential_prey: List[Critter]) -> Optional[Critter]:
-        """
-        Calculates a vulnerability score for each potential prey and returns
-        the one with the highest score.
-        """
-        best_target = None
-        max_vulnerability_score = -1
-
-        for prey in potential_prey:
-            health_score = (prey.max_health / (prey.health + 1)
-                            ) * HEALTH_VULNERABILITY_WEIGHT
-            energy_score = (MAX_ENERGY / (prey.energy + 1)) * \
-                ENERGY_VULNERABILITY_WEIGHT
+# Populations no bigger than this are scanned without numpy, as building the
+# arrays costs more than the scan itself.
+SMALL_POPULATION = 4
 
-            distraction_bonus = 0
-            if prey.ai_state in [AIState.EATING, AIState.DRINKING]:
-                distraction_bonus = DISTRACTION_VULNERABILITY_BONUS
 
-            distance = abs(prey.x - critter.x) + abs(prey.y - critter.y)
-            distance_penalty = distance / critter.perception
+@dataclass
+class PreyScan:
+    """What a carnivore found in one pass over the critters around it."""
 
-            total_score = (health_score + energy_score +
-                           distraction_bonus) - distance_penalty
+    # The first prey next to the carnivore. Nothing else is looked for once
+    # there is one.
+    adjacent: Optional[Critter] = None
+    # The most vulnerable prey within perception.
+    hunt_target: Optional[Critter] = None
+    prey_in_ambush_range: bool = False
+    # The most vulnerable prey within the ambush radius.
+    ambush_target: Optional[Critter] = None
 
-            if total_score > max_vulnerability_score:
-                max_vulnerability_score = total_score
-                best_target = prey
 
-        return best_target
+class HuntingBehavior(ForagingBehavior):
+    def _vulnerability(self, critter: Critter, prey: Critter) -> float:
+        """The same score `_scan_prey` gives, for a single prey."""
+        health_score = (prey.max_health / (prey.health + 1)) * HEALTH_VULNERABILITY_WEIGHT
+        energy_score = (MAX_ENERGY / (prey.energy + 1)) * ENERGY_VULNERABILITY_WEIGHT
+        bonus = (
+            DISTRACTION_VULNERABILITY_BONUS
+            if prey.ai_state in DISTRACTED_STATES
+            else 0.0
+        )
+
+        distance = abs(prey.x - critter.x) + abs(prey.y - critter.y)
+        return (health_score + energy_score + bonus) - distance / float(critter.perception)
+
+    def _scalar_path(
+        self, critter: Critter, critters: Sequence[Critter], ambush_radius: int
+    ) -> PreyScan:
+        """
+        Scans for prey with a plain Python loop, which beats setting up numpy
+        arrays when there are only a handful of critters.
+        """
+        scan = PreyScan()
+        hunt_score, ambush_score = -1.0, -1.0
+
+        for prey in critters:
+            if prey.diet != DietType.HERBIVORE or prey.is_ghost:
+                continue
+
+            abs_dx = abs(prey.x - critter.x)
+            abs_dy = abs(prey.y - critter.y)
+            # For non-negative ints, (a | b) <= 1 iff both are at most 1.
+            if (abs_dx | abs_dy) <= 1:
+                return PreyScan(adjacent=prey)
+
+            distance = max(abs_dx, abs_dy)
+            in_hunt_range = distance <= critter.perception
+            in_ambush_range = distance <= ambush_radius
+            if not (in_hunt_range or in_ambush_range):
+                continue
+
+            score = self._vulnerability(critter, prey)
+            if in_hunt_range and score > hunt_score:
+                hunt_score = score
+                scan.hunt_target = prey
+            if in_ambush_range:
+                scan.prey_in_ambush_range = True
+                if score > ambush_score:
+                    ambush_score = score
+                    scan.ambush_target = prey
+
+        return scan
+
+    def _vector_path(
+        self, critter: Critter, batch: CritterBatch, ambush_radius: int
+    ) -> PreyScan:
+        """Scans a batch of critters for prey in one compiled pass."""
+        adjacent, hunt_target, prey_in_ambush_range, ambush_target = _scan_prey(
+            batch.xs,
+            batch.ys,
+            (batch.diet == DietType.HERBIVORE.value) & ~batch.is_ghost,
+            batch.health,
+            batch.max_health,
+            batch.energy,
+            batch.distracted,
+            critter.x,
+            critter.y,
+            float(critter.perception),
+            float(ambush_radius),
+        )
+
+        def critter_at(i: int) -> Optional[Critter]:
+            return batch.critters[i] if i >= 0 else None
+
+        return PreyScan(
+            adjacent=critter_at(adjacent),
+            hunt_target=critter_at(hunt_target),
+            prey_in_ambush_range=prey_in_ambush_range,
+            ambush_target=critter_at(ambush_target),
+        )
 
     def get_action(
         self, critter: Critter, world: World, all_critters: List[Critter]
@@ -64,60 +147,52 @@ class HuntingBehavior(ForagingBehavior):
         prey to hunt (SEEK_FOOD).
         Returns a complete action dictionary, or None.
         """
-        potential_prey = [
-            other
-            for other in all_critters
-            if other.diet == DietType.HERBIVORE and not other.is_ghost
-        ]
+        ambush_radius = max(2, int(critter.perception / 2))
+
+        if len(all_critters) <= SMALL_POPULATION:
+            scan = self._scalar_path(critter, all_critters, ambush_radius)
+        else:
+            nearby = get_index(all_critters).query_ids(
+                critter.x, critter.y, max(critter.perception, ambush_radius)
+            )
+            scan = self._vector_path(
+                critter, get_batch(all_critters).take(nearby), ambush_radius
+            )
 
         # 1. First, check for adjacent prey to ATTACK.
-        adjacent_prey = [
-            prey
-            for prey in potential_prey
-            if abs(prey.x - critter.x) <= 1 and abs(prey.y - critter.y) <= 1
-        ]
-        if adjacent_prey:
+        if scan.adjacent is not None:
             # If prey is adjacent, the action is to ATTACK.
-            return AIAction(type=ActionType.ATTACK, target_critter=adjacent_prey[0])
+            return AIAction(type=ActionType.ATTACK, target_critter=scan.adjacent)
 
         if critter.hunger >= HUNGER_TO_START_HUNTING:
             # 2. If no adjacent prey, scan the wider area to find a target to hunt.
-            nearby_herbivores = [
-                prey
-                for prey in potential_prey
-                if abs(prey.x - critter.x) <= critter.perception
-                and abs(prey.y - critter.y) <= critter.perception
-            ]
-
-            if nearby_herbivores:
-                best_target = self._find_best_target(
-                    critter, nearby_herbivores)
-
-                if best_target:
-                    # Cost/benefit analysis
-                    energy_ratio = critter.energy / MAX_ENERGY
-                    max_chase_distance = critter.perception * \
-                        energy_ratio * HUNTING_WILLINGNESS_FACTOR
-
-                    distance_to_target = abs(
-                        best_target.x - critter.x) + abs(best_target.y - critter.y)
-
-                    # Only commit to the chase if the target is within the willingness distance.
-                    if distance_to_target <= max_chase_distance:
-                        end_pos = (best_target.x, best_target.y)
-                        # If prey is found, and we can find a path to it, MOVE to it.
-                        path = find_path(
-                            world, (critter.x, critter.y), end_pos)
-
-                        if path and len(path) > 1:
-                            next_step = path[1]
-
-                            return AIAction(
-                                type=ActionType.MOVE,
-                                dx=next_step[0] - critter.x,
-                                dy=next_step[1] - critter.y,
-                                target=end_pos,
-                            )
+            best_target = scan.hunt_target
+
+            if best_target:
+                # Cost/benefit analysis
+                energy_ratio = critter.energy / MAX_ENERGY
+                max_chase_distance = critter.perception * \
+                    energy_ratio * HUNTING_WILLINGNESS_FACTOR
+
+                distance_to_target = abs(
+                    best_target.x - critter.x) + abs(best_target.y - critter.y)
+
+                # Only commit to the chase if the target is within the willingness distance.
+                if distance_to_target <= max_chase_distance:
+                    end_pos = (best_target.x, best_target.y)
+                    # If prey is found, and we can find a path to it, MOVE to it.
+                    path = find_path(
+                        world, (critter.x, critter.y), end_pos)
+
+                    if path and len(path) > 1:
+                        next_step = path[1]
+
+                        return AIAction(
+                            type=ActionType.MOVE,
+                            dx=next_step[0] - critter.x,
+                            dy=next_step[1] - critter.y,
+                            target=end_pos,
+                        )
 
         if critter.hunger >= HUNGER_TO_START_AMBUSHING:
             # 3. If no adjacent prey, and only moderately hungry, see if there's
@@ -125,18 +200,9 @@ class HuntingBehavior(ForagingBehavior):
             if critter.thirst >= THIRST_TO_START_DRINKING or critter.energy < ENERGY_TO_START_RESTING:
                 return None
 
-            ambush_radius = max(2, int(critter.perception / 2))
-            nearby_herbivores = [
-                prey
-                for prey in potential_prey
-                if abs(prey.x - critter.x) <= ambush_radius
-                and abs(prey.y - critter.y) <= ambush_radius
-            ]
-
-            if nearby_herbivores:
-                best_target = self._find_best_target(
-                    critter, nearby_herbivores)
+            best_target = scan.ambush_target
 
+            if scan.prey_in_ambush_range:
                 if best_target:
                   # If prey is found, and we can find a path to it, MOVE to it.
                   end_pos = (best_target.x, best_target.y)
@@ -157,3 +223,7 @@ class HuntingBehavior(ForagingBehavior):
 
         # 3. If no action can be taken, return None.
         return None
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = HuntingBehavior()
@@ -1,4 +1,7 @@
 from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from simulation.behaviours.behavior import AIAction, Behavior
 from simulation.brain import (
     MIN_HEALTH_TO_BREED,
@@ -6,8 +9,10 @@ from simulation.brain import (
     MAX_THIRST_TO_BREED,
     ActionType,
 )
+from simulation.critter_batch import get_batch
 from simulation.models import Critter
 from simulation.pathfinding import find_path
+from simulation.spatial_index import get_index
 from simulation.world import World
 
 
@@ -25,33 +30,37 @@ class MateSeekingBehavior(Behavior):
         Returns a complete action dictionary, or None.
         """
         # First, find all suitable mates within sensing range
-        potential_mates = [
-            other
-            for other in all_critters
-            if other.id != critter.id
-            and other.diet == critter.diet
-            and abs(other.x - critter.x) <= MATE_SENSE_RADIUS
-            and abs(other.y - critter.y) <= MATE_SENSE_RADIUS
-            and other.health >= MIN_HEALTH_TO_BREED
-            and other.hunger < MAX_HUNGER_TO_BREED
-            and other.thirst < MAX_THIRST_TO_BREED
-            and other.breeding_cooldown == 0
-        ]
-
-        if not potential_mates:
+        nearby = get_index(all_critters).query_ids(
+            critter.x, critter.y, MATE_SENSE_RADIUS
+        )
+        batch = get_batch(all_critters).take(nearby)
+        potential_mates = (
+            (batch.ids != critter.id)
+            & (batch.diet == critter.diet.value)
+            & (batch.health >= MIN_HEALTH_TO_BREED)
+            & (batch.hunger < MAX_HUNGER_TO_BREED)
+            & (batch.thirst < MAX_THIRST_TO_BREED)
+            & (batch.breeding_cooldown == 0)
+        )
+
+        if not potential_mates.any():
             return None  # No suitable mates found
 
+        abs_dx = np.abs(batch.xs - critter.x)
+        abs_dy = np.abs(batch.ys - critter.y)
+
         # 1. Check if any of the potential mates are adjacent.
-        for mate in potential_mates:
-            if abs(mate.x - critter.x) <= 1 and abs(mate.y - critter.y) <= 1:
-                # If a mate is adjacent, the action is to BREED.
-                return AIAction(type=ActionType.BREED, target_critter=mate)
+        # For non-negative ints, (a | b) <= 1 iff both are at most 1.
+        adjacent_mates = np.flatnonzero(potential_mates & ((abs_dx | abs_dy) <= 1))
+        if adjacent_mates.size:
+            # If a mate is adjacent, the action is to BREED.
+            return AIAction(
+                type=ActionType.BREED, target_critter=batch.critters[adjacent_mates[0]]
+            )
 
         # 2. If no mate is adjacent, find the closest one to move towards.
-        closest_mate = min(
-            potential_mates,
-            key=lambda c: abs(c.x - critter.x) + abs(c.y - critter.y),
-        )
+        distance = np.where(potential_mates, abs_dx + abs_dy, np.iinfo(np.int32).max)
+        closest_mate = batch.critters[int(np.argmin(distance))]
 
         start_pos = (critter.x, critter.y)
         end_pos = (closest_mate.x, closest_mate.y)
@@ -69,3 +78,7 @@ class MateSeekingBehavior(Behavior):
 
         # If there's no path to the mate, just return None
         return None
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = MateSeekingBehavior()
@@ -1,5 +1,8 @@
 import random
-from typing import Optional
+from typing import List, Optional, Tuple
+
+import numpy as np
+
 from simulation import logger
 from simulation.action_type import ActionType
 from simulation.behaviours.behavior import AIAction
@@ -23,42 +26,116 @@ POSSIBLE_DIRECTIONS = [
     (1, 1),
 ]
 
+# get_action draws from a pre-generated buffer of uniform floats rather than
+# calling into the generator for every decision.
+_RANDOM_BUFFER_SIZE = 1024
+_random_buffer: List[float] = []
+_random_pos = 0
+
+
+def _rng() -> np.random.Generator:
+    """
+    A generator seeded from the `random` module, so random.seed() still
+    decides how critters wander.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _next_random() -> float:
+    """Returns the next uniform float in [0, 1) from the buffer."""
+    global _random_buffer, _random_pos
+    if _random_pos >= len(_random_buffer):
+        _random_buffer = _rng().random(_RANDOM_BUFFER_SIZE).tolist()
+        _random_pos = 0
+    value = _random_buffer[_random_pos]
+    _random_pos += 1
+    return value
+
+
+def reset_random():
+    """
+    Discards the buffered draws, so the next decision comes from the
+    `random` module's current state, e.g. right after random.seed().
+    """
+    global _random_buffer, _random_pos
+    _random_buffer = []
+    _random_pos = 0
+
+
+def _valid_directions(critter: Critter, world: World) -> List[Tuple[int, int]]:
+    """Returns the directions that don't lead the critter into water."""
+    valid_directions = []
+    for dx, dy in POSSIBLE_DIRECTIONS:
+        tile = world.get_tile(critter.x + dx, critter.y + dy)
+        if tile.terrain != TerrainType.WATER:
+            valid_directions.append((dx, dy))
+    return valid_directions
+
+
+def _can_keep_momentum(critter: Critter, valid_directions) -> bool:
+    """True if the critter is moving and its heading is not blocked."""
+    has_momentum = critter.vx != 0 or critter.vy != 0
+
+    # Normalize the velocity vector to get its direction (e.g., (5.0, 0.0) -> (1, 0))
+    momentum_direction_dx = 1 if critter.vx > 0 else -1 if critter.vx < 0 else 0
+    momentum_direction_dy = 1 if critter.vy > 0 else -1 if critter.vy < 0 else 0
+    momentum_direction = (momentum_direction_dx, momentum_direction_dy)
+
+    return has_momentum and momentum_direction in valid_directions
+
 
 class WanderingBehavior(MovingBehavior):
+    @classmethod
+    def sample_dx_dy(
+        cls, critter: Critter, world: World, n: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draws n wander steps at once from the same distribution get_action
+        uses, returning the dx and dy of each as arrays. Like get_action, a
+        step that keeps the critter's momentum is its velocity, unchanged.
+        """
+        valid_directions = _valid_directions(critter, world)
+        if not valid_directions:
+            return np.zeros(n, dtype=np.int8), np.zeros(n, dtype=np.int8)
+
+        choices = valid_directions
+        weights = np.full(len(valid_directions), 1.0 / len(valid_directions))
+        if _can_keep_momentum(critter, valid_directions):
+            choices = valid_directions + [(critter.vx, critter.vy)]
+            weights = np.append(
+                weights * DIRECTION_CHANGE_PROBABILITY,
+                1.0 - DIRECTION_CHANGE_PROBABILITY,
+            )
+
+        steps = _rng().choice(np.array(choices), size=n, p=weights)
+        return steps[:, 0], steps[:, 1]
+
     def get_action(self, critter: Critter, world: World, _) -> Optional[AIAction]:
         """
         Determines a direction in which to wander, biasing towards
         the critter's last known velocity.
         """
-        valid_directions = []
-        for dx, dy in POSSIBLE_DIRECTIONS:
-            tile = world.get_tile(critter.x + dx, critter.y + dy)
-            if tile.terrain != TerrainType.WATER:
-                valid_directions.append((dx, dy))
+        valid_directions = _valid_directions(critter, world)
 
         if not valid_directions:
             logger.warning(f"{critter.id} is trapped unable to move")
             return AIAction(type=ActionType.MOVE, dx=0, dy=0)
 
-        has_momentum = critter.vx != 0 or critter.vy != 0
-
-        # Normalize the velocity vector to get its direction (e.g., (5.0, 0.0) -> (1, 0))
-        momentum_direction_dx = 1 if critter.vx > 0 else -1 if critter.vx < 0 else 0
-        momentum_direction_dy = 1 if critter.vy > 0 else -1 if critter.vy < 0 else 0
-        momentum_direction = (momentum_direction_dx, momentum_direction_dy)
-
-        momentum_is_valid = momentum_direction in valid_directions
-
         dx: float
         dy: float
         if (
-            has_momentum
-            and momentum_is_valid
-            and random.random() > DIRECTION_CHANGE_PROBABILITY
+            _can_keep_momentum(critter, valid_directions)
+            and _next_random() > DIRECTION_CHANGE_PROBABILITY
         ):
             dx, dy = critter.vx, critter.vy
         else:
-            chosen_direction = random.choice(valid_directions)
+            chosen_direction = valid_directions[
+                int(_next_random() * len(valid_directions))
+            ]
             dx, dy = chosen_direction
 
         return AIAction(type=ActionType.MOVE, dx=dx, dy=dy)
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = WanderingBehavior()
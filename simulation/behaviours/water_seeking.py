@@ -1,4 +1,7 @@
 from typing import Any, Dict, Optional
+
+import numpy as np
+
 from simulation.behaviours.behavior import AIAction, Behavior
 from simulation.brain import SENSE_RADIUS, ActionType
 from simulation.models import Critter
@@ -7,6 +10,19 @@ from simulation.terrain_type import TerrainType
 from simulation.world import World
 
 
+# Manhattan distance from the centre of the scan window to each tile in it.
+_WINDOW_DISTANCES = np.fromfunction(
+    lambda row, col: np.abs(row - SENSE_RADIUS) + np.abs(col - SENSE_RADIUS),
+    (2 * SENSE_RADIUS + 1, 2 * SENSE_RADIUS + 1),
+    dtype=np.int32,
+)
+
+# (dx, dy) of the eight tiles around a critter, in row-major order.
+_ADJACENT_OFFSETS = tuple(
+    (dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy) != (0, 0)
+)
+
+
 class WaterSeekingBehavior(Behavior):
     def get_action(self, critter: Critter, world: World, _) -> Optional[AIAction]:
         """
@@ -15,38 +31,36 @@ class WaterSeekingBehavior(Behavior):
         water (SEEK_WATER).
         Returns a complete action dictionary, or None.
         """
+        # Fetch the terrain once, one tile wider than the scan so the shore
+        # around any water it finds is known too.
+        _, terrain = world.get_tile_slab(
+            critter.x - SENSE_RADIUS - 1,
+            critter.y - SENSE_RADIUS - 1,
+            2 * SENSE_RADIUS + 3,
+            2 * SENSE_RADIUS + 3,
+        )
+        water = terrain == TerrainType.WATER.value
+        centre = SENSE_RADIUS + 1
+
         # 1. First, check if we are already next to water.
-        surroundings = [
-            world.get_tile(critter.x + dx, critter.y + dy)
-            for dy in [-1, 0, 1]
-            for dx in [-1, 0, 1]
-            if not (dx == 0 and dy == 0)
-        ]
-        is_near_water = any(tile.terrain == TerrainType.WATER for tile in surroundings)
+        is_near_water = any(
+            water[centre + dy, centre + dx] for dx, dy in _ADJACENT_OFFSETS
+        )
 
         if is_near_water:
             # If we are, the correct action is to DRINK.
             return AIAction(type=ActionType.DRINK)
 
         # 2. If not adjacent, scan the wider area for water to move towards.
-        scan_range = range(-SENSE_RADIUS, SENSE_RADIUS + 1)
-        wide_surroundings = [
-            world.get_tile(critter.x + sx, critter.y + sy)
-            for sy in scan_range
-            for sx in scan_range
-            if not (sx == 0 and sy == 0)
-        ]
+        in_range = water[1:-1, 1:-1].copy()
+        in_range[SENSE_RADIUS, SENSE_RADIUS] = False
 
-        water_tiles = [
-            tile for tile in wide_surroundings if tile.terrain == TerrainType.WATER
-        ]
-
-        if not water_tiles:
+        if not in_range.any():
             # No water found in range.  Trigger a move action.
             return None
 
         # 3. Find the closest accessible land tile next to the water.
-        best_target_tile = self._find_closest_shore(critter, world, water_tiles)
+        best_target_tile = self._find_closest_shore(critter, world, water, in_range)
 
         if not best_target_tile:
             # No shoreline found.. Just move.
@@ -70,29 +84,31 @@ class WaterSeekingBehavior(Behavior):
         # If no path was found return None.
         return None
 
-    def _find_closest_shore(self, critter, world, water_tiles):
-        """Helper function to find the best land tile adjacent to water."""
-        closest_water_tile = min(
-            water_tiles,
-            key=lambda tile: abs(tile.x - critter.x) + abs(tile.y - critter.y),
+    def _find_closest_shore(self, critter, world, water, in_range):
+        """
+        Helper function to find the best land tile adjacent to water.
+        `in_range` is the water that was scanned for and `water` is the same
+        area with a one tile border.
+        """
+        # argmin returns the first minimum in row-major order, matching a
+        # scan over rows then columns.
+        closest = int(
+            np.argmin(np.where(in_range, _WINDOW_DISTANCES, np.iinfo(np.int32).max))
         )
+        water_row, water_col = divmod(closest, in_range.shape[1])
 
-        shore_tiles = []
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-
-                potential_shore_tile = world.get_tile(
-                    closest_water_tile.x + dx, closest_water_tile.y + dy
-                )
-                if potential_shore_tile.terrain != TerrainType.WATER:
-                    shore_tiles.append(potential_shore_tile)
+        shore_tiles = [
+            (water_row + dy, water_col + dx)
+            for dx, dy in _ADJACENT_OFFSETS
+            if not water[water_row + dy + 1, water_col + dx + 1]
+        ]
 
         if not shore_tiles:
             return None
 
-        return min(
-            shore_tiles,
-            key=lambda tile: abs(tile.x - critter.x) + abs(tile.y - critter.y),
-        )
+        row, col = min(shore_tiles, key=lambda rc: abs(rc[0] - SENSE_RADIUS) + abs(rc[1] - SENSE_RADIUS))
+        return world.get_tile(critter.x + col - SENSE_RADIUS, critter.y + row - SENSE_RADIUS)
+
+
+# The behavior holds no state, so every brain can share one instance.
+INSTANCE = WaterSeekingBehavior()
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional, Tuple
 from simulation.behaviours.behavior import AIAction, Behavior
-from simulation.behaviours.wandering import WanderingBehavior
+from simulation.behaviours import wandering
 from simulation.goal_type import GoalType
 from simulation.action_type import ActionType
 from simulation.mapping import STATE_TO_GOAL_MAP
@@ -54,7 +54,7 @@ class CritterAI:
         self.mate_seeking_module = modules.get("mate_seeking")
         self.moving_module = modules.get("moving")
         self.breeding_module = modules.get("breeding")
-        self.wandering_module = WanderingBehavior()
+        self.wandering_module = wandering.INSTANCE
 
     def determine_action(self) -> Tuple[GoalType, AIAction]:
         """
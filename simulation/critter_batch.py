@@ -0,0 +1,109 @@
+import logging
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from simulation.models import AIState, Critter
+
+DISTRACTED_STATES = (AIState.EATING, AIState.DRINKING)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CritterBatch:
+    """
+    The fields the behaviours filter and score critters on, stored as
+    parallel arrays so they can be processed in vectorized passes.
+    """
+
+    critters: Sequence[Critter]
+    ids: np.ndarray
+    xs: np.ndarray
+    ys: np.ndarray
+    diet: np.ndarray
+    is_ghost: np.ndarray
+    health: np.ndarray
+    max_health: np.ndarray
+    energy: np.ndarray
+    hunger: np.ndarray
+    thirst: np.ndarray
+    breeding_cooldown: np.ndarray
+    distracted: np.ndarray
+    # The row of each critter, by id.
+    rows: Dict[int, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_critters(cls, critters: Sequence[Critter]) -> "CritterBatch":
+        n = len(critters)
+        return cls(
+            critters=critters,
+            rows={c.id: row for row, c in enumerate(critters)},
+            **{
+                name: np.fromiter((get(c) for c in critters), dtype=dtype, count=n)
+                for name, (dtype, get) in _COLUMNS.items()
+            },
+        )
+
+    def take(self, rows: np.ndarray) -> "CritterBatch":
+        """Returns a new batch holding just the given rows, in that order."""
+        batch = CritterBatch(
+            critters=[self.critters[row] for row in rows],
+            **{name: getattr(self, name)[rows] for name in _COLUMNS},
+        )
+        batch.rows = {critter_id: row for row, critter_id in enumerate(batch.ids.tolist())}
+        return batch
+
+    def refresh(self, row: int):
+        """Re-reads one row from its critter after the critter has changed."""
+        critter = self.critters[row]
+        for name, (_, get) in _COLUMNS.items():
+            getattr(self, name)[row] = get(critter)
+
+
+# How to fill each array of a CritterBatch from a critter.
+_COLUMNS = {
+    "ids": (np.int64, attrgetter("id")),
+    "xs": (np.int32, attrgetter("x")),
+    "ys": (np.int32, attrgetter("y")),
+    "diet": (np.uint8, lambda c: c.diet.value),
+    "is_ghost": (bool, attrgetter("is_ghost")),
+    # Scores stay in float64 so ties resolve exactly as before.
+    "health": (np.float64, attrgetter("health")),
+    "max_health": (np.float64, attrgetter("max_health")),
+    "energy": (np.float64, attrgetter("energy")),
+    "hunger": (np.float64, attrgetter("hunger")),
+    "thirst": (np.float64, attrgetter("thirst")),
+    "breeding_cooldown": (np.int32, attrgetter("breeding_cooldown")),
+    "distracted": (bool, lambda c: c.ai_state in DISTRACTED_STATES),
+}
+
+
+# The batch for the critter list currently being simulated.
+_cached_critters: Optional[Sequence[Critter]] = None
+_cached_batch: Optional[CritterBatch] = None
+
+
+def get_batch(critters: Sequence[Critter]) -> CritterBatch:
+    """
+    Returns the batch for a list of critters, building it the first time
+    the list is seen so every behaviour in a tick shares one conversion.
+    """
+    global _cached_critters, _cached_batch
+    if (
+        _cached_critters is not critters
+        or _cached_batch is None
+        or len(_cached_batch.critters) != len(critters)
+    ):
+        _cached_critters = critters
+        _cached_batch = CritterBatch.from_critters(critters)
+        logger.debug(f"Built critter batch for {len(critters)} critters")
+    return _cached_batch
+
+
+def critter_changed(critters: Sequence[Critter], critter: Critter):
+    """Keeps the batch for `critters`, if there is one, in step with a critter."""
+    if _cached_critters is critters and _cached_batch is not None:
+        _cached_batch.refresh(_cached_batch.rows[critter.id])
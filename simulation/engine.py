@@ -2,13 +2,15 @@ import logging
 import random
 import copy
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from seasons import Season, season_manager
 from simulation.agent import DQNAgent
+from simulation.critter_batch import critter_changed
 from simulation.goal_type import GoalType
 from simulation.mapping import GOAL_TO_STATE_MAP
 from simulation.reward_function import get_reward_for_goal
+from simulation.spatial_index import critter_moved
 from simulation.state_space import get_state_for_critter
 from simulation.statistics import record_statistics, record_training_statistics
 from simulation.terrain_type import TerrainType
@@ -95,6 +97,16 @@ _training_indices = {
 }
 
 
+class _Birth(NamedTuple):
+    """A birth whose events are logged once the child has an ID."""
+
+    child: Critter
+    parent1_id: int
+    parent1_age: int
+    parent2_id: int
+    parent2_age: int
+
+
 def run_simulation_tick(tick: int, world_tick: int, world: World, session: Session, agents: Dict[DietType, DQNAgent]):
     """Process one tick of the world simulation. Called periodically."""
     print(".", end="")
@@ -170,6 +182,9 @@ def _process_critter_ai(world: World, session: Session, agents: Dict[DietType, D
     for c in all_critters:
         critters_by_diet[c.diet].append(c)
 
+    # Births this tick, logged together at the end of the critter updates.
+    births: List[_Birth] = []
+
     critters_to_process = []
     for diet, critters in critters_by_diet.items():
         if not critters:
@@ -195,11 +210,14 @@ def _process_critter_ai(world: World, session: Session, agents: Dict[DietType, D
             logger.info(f"Skipping update for ghost {critter.id}")
             continue
         reward, concordance = _run_critter_logic(
-            critter, world, session, all_critters, agents)
+            critter, world, session, all_critters, agents, births)
+        critter_changed(all_critters, critter)
         if reward is not None:
             rewards_this_tick[critter.diet].append(reward)
             concordance_this_tick[critter.diet].append(concordance)
 
+    _log_births(session, births)
+
     if agents:
         if len(agents[DietType.HERBIVORE].memory) > BATCH_SIZE:
             agents[DietType.HERBIVORE].replay(BATCH_SIZE)
@@ -268,10 +286,12 @@ def _run_critter_logic(
     session: Session,
     all_critters: List[Critter],
     agents: Dict[DietType, DQNAgent],
+    births: List[_Birth],
 ) -> tuple[Optional[float], bool]:
     """
     The main AI dispatcher for a single critter's turn.
     It creates the appropriate AI brain, gets an action, and executes it.
+    Any birth is added to `births`.
     Returns any calculated reward.
     """
     agent = agents[critter.diet]
@@ -377,6 +397,7 @@ def _run_critter_logic(
         amount_to_eat = min(current_tile.food_available, GRASS_EAT_AMOUNT)
         new_tile_food = current_tile.food_available - amount_to_eat
         _update_tile_food(session, critter.x, critter.y, new_tile_food)
+        world.update_food(critter.x, critter.y, new_tile_food)
 
         critter.hunger -= (
             amount_to_eat / GRASS_EAT_AMOUNT
@@ -462,10 +483,13 @@ def _run_critter_logic(
                     f"Survived attack from {critter.id}",
                 )
 
+            critter_changed(all_critters, prey)
+
     elif action_type == ActionType.BREED:
         mate = action.target_critter
         logger.info(f"    breeding: {mate.id}")
-        _reproduce(critter, mate, session)
+        _reproduce(critter, mate, session, births)
+        critter_changed(all_critters, mate)
 
     elif action_type == ActionType.AMBUSH:
         # Do nothing this tick.  Spend minimum energy possible
@@ -595,6 +619,9 @@ def _execute_move(
     else:
         critter.vx, critter.vy = critter.x - old_x, critter.y - old_y
 
+    if (critter.x, critter.y) != (old_x, old_y):
+        critter_moved(all_critters, critter)
+
 
 def _handle_death(critter: Critter, cause: CauseOfDeath, session: Session):
     """Handles the death of a critter"""
@@ -611,7 +638,7 @@ def _handle_death(critter: Critter, cause: CauseOfDeath, session: Session):
 
     logger.info(f"    {critter.id} died of {cause.name}")
     description = f"Died of {cause.name}."
-    _log_event(session, critter.id, critter.age, Event.DEATH, description)
+    death_event = _new_event(critter.id, critter.age, Event.DEATH, description)
 
     dead_critter = DeadCritter(
         original_id=critter.id,
@@ -624,12 +651,12 @@ def _handle_death(critter: Critter, cause: CauseOfDeath, session: Session):
         parent_one_id=critter.parent_one_id,
         parent_two_id=critter.parent_two_id,
     )
-    session.add(dead_critter)
+    session.add_all([death_event, dead_critter])
     session.delete(critter)
 
 
-def _reproduce(parent1: Critter, parent2: Critter, session: Session):
-    """Creates a new offspring from two parents"""
+def _reproduce(parent1: Critter, parent2: Critter, session: Session, births: List[_Birth]):
+    """Creates a new offspring from two parents, adding its birth to `births`."""
     logger.info(f"  {parent1} and {parent2} are breeding")
 
     child_speed = random.choice([parent1.speed, parent2.speed])
@@ -673,29 +700,10 @@ def _reproduce(parent1: Critter, parent2: Critter, session: Session):
     )
     session.add(child)
 
-    # Flush the session to ensure we get IDs set so we can log events.
-    session.flush()
-
-    _log_event(
-        session,
-        child.id,
-        child.age,
-        Event.BIRTH,
-        f"Born to parents {parent1.id} and {parent2.id}",
-    )
-    _log_event(
-        session,
-        parent1.id,
-        parent1.age,
-        Event.BREED,
-        f"Bred with {parent2.id} to produce {child.id}",
-    )
-    _log_event(
-        session,
-        parent2.id,
-        parent2.age,
-        Event.BREED,
-        f"Bred with {parent1.id} to produce {child.id}",
+    # The child has no ID until the session is flushed, so its events are
+    # logged with the rest of this tick's births.
+    births.append(
+        _Birth(child, parent1.id, parent1.age, parent2.id, parent2.age)
     )
 
     parent1.energy -= BREEDING_ENERGY_COST
@@ -704,11 +712,50 @@ def _reproduce(parent1: Critter, parent2: Critter, session: Session):
     parent2.breeding_cooldown = BREEDING_COOLDOWN_TICKS
 
 
+def _log_births(session: Session, births: List[_Birth]):
+    """Logs the events for this tick's births, with a single flush."""
+    if not births:
+        return
+
+    # Flush the session to ensure we get IDs set so we can log events.
+    session.flush()
+
+    events = []
+    for birth in births:
+        child = birth.child
+        events += [
+            _new_event(
+                child.id,
+                child.age,
+                Event.BIRTH,
+                f"Born to parents {birth.parent1_id} and {birth.parent2_id}",
+            ),
+            _new_event(
+                birth.parent1_id,
+                birth.parent1_age,
+                Event.BREED,
+                f"Bred with {birth.parent2_id} to produce {child.id}",
+            ),
+            _new_event(
+                birth.parent2_id,
+                birth.parent2_age,
+                Event.BREED,
+                f"Bred with {birth.parent1_id} to produce {child.id}",
+            ),
+        ]
+    session.add_all(events)
+
+
+def _new_event(
+    critter_id: int, tick: int, event: Event, description: str
+) -> CritterEvent:
+    return CritterEvent(
+        critter_id=critter_id, tick=tick, event=event, description=description
+    )
+
+
 def _log_event(
     session: Session, critter_id: int, tick: int, event: Event, description: str
 ):
     """Creates and saves a new CritterEvent to the session"""
-    event = CritterEvent(
-        critter_id=critter_id, tick=tick, event=event, description=description
-    )
-    session.add(event)
+    session.add(_new_event(critter_id, tick, event, description))
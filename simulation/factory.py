@@ -1,46 +1,56 @@
-from typing import List
-from simulation.behaviours.breeding import BreedingBehavior
-from simulation.behaviours.flocking import FlockingBehavior
-from simulation.behaviours.wandering import WanderingBehavior
+from functools import lru_cache
+from typing import Dict, List
+from simulation.behaviours import (
+    breeding,
+    fleeing,
+    flocking,
+    grazing,
+    hunting,
+    mate_seeking,
+    wandering,
+    water_seeking,
+)
+from simulation.behaviours.behavior import Behavior
 from simulation.models import Critter, DietType
-from simulation.behaviours.water_seeking import WaterSeekingBehavior
-from simulation.behaviours.mate_seeking import MateSeekingBehavior
-from simulation.behaviours.grazing import GrazingBehavior
-from simulation.behaviours.fleeing import FleeingBehavior
-from simulation.behaviours.hunting import HuntingBehavior
 from simulation.brain import CritterAI
 from simulation.world import World
 
 
-def create_ai_for_critter(
-    critter: Critter, world: World, all_critters: List[Critter]
-) -> CritterAI:
+@lru_cache(maxsize=None)
+def _modules_for_diet(diet: DietType) -> Dict[str, Behavior]:
     """
-    Factory function that assembles the correct AI brain and modules
-    based on the critter's diet.
+    The behavior modules for a diet. Modules hold no per-critter state, so
+    every brain shares the same instances.
     """
     shared_modules = {
-        "water_seeking": WaterSeekingBehavior(),
-        "mate_seeking": MateSeekingBehavior(),
-        "breeding": BreedingBehavior(),
+        "water_seeking": water_seeking.INSTANCE,
+        "mate_seeking": mate_seeking.INSTANCE,
+        "breeding": breeding.INSTANCE,
     }
 
-    if critter.diet == DietType.HERBIVORE:
+    if diet == DietType.HERBIVORE:
         herbivore_modules = {
-            "foraging": GrazingBehavior(),
-            "fleeing": FleeingBehavior(),
-            "moving": FlockingBehavior(),
+            "foraging": grazing.INSTANCE,
+            "fleeing": fleeing.INSTANCE,
+            "moving": flocking.INSTANCE,
         }
-        modules = {**shared_modules, **herbivore_modules}
+        return {**shared_modules, **herbivore_modules}
 
-    elif critter.diet == DietType.CARNIVORE:
+    elif diet == DietType.CARNIVORE:
         carnivore_modules = {
-            "foraging": HuntingBehavior(),
-            "moving": WanderingBehavior(),
+            "foraging": hunting.INSTANCE,
+            "moving": wandering.INSTANCE,
         }
-        modules = {**shared_modules, **carnivore_modules}
+        return {**shared_modules, **carnivore_modules}
+
+    raise NotImplementedError(f"unknown diet {diet.name}")
 
-    else:
-        raise NotImplementedError(f"unknown diet {critter.diet}")
 
-    return CritterAI(critter, world, all_critters, modules)
+def create_ai_for_critter(
+    critter: Critter, world: World, all_critters: List[Critter]
+) -> CritterAI:
+    """
+    Factory function that assembles the correct AI brain and modules
+    based on the critter's diet.
+    """
+    return CritterAI(critter, world, all_critters, _modules_for_diet(critter.diet))
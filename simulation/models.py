@@ -1,5 +1,5 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 from simulation.action_type import ActionType
 from sqlalchemy import orm
 from web_server import db
@@ -17,9 +17,11 @@ class CauseOfDeath(enum.Enum):
     EXHAUSTION = "exhaustion"
 
 
+# The values are the codes diets are stored as in numpy arrays. Columns
+# store the member names, so the values never reach the database.
 class DietType(enum.Enum):
-    HERBIVORE = "herbivore"
-    CARNIVORE = "carnivore"
+    HERBIVORE = 1
+    CARNIVORE = 2
 
 
 class AIState(enum.Enum):
@@ -84,6 +86,8 @@ class Player(db.Model):
 
 class Critter(db.Model):
     __tablename__ = "critter"
+    # For looking up the critters in a rectangle of the world.
+    __table_args__ = (db.Index("ix_critter_xy", "x", "y"),)
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -92,7 +96,7 @@ class Critter(db.Model):
         db.Enum(DietType),
         nullable=False,
         default=DietType.HERBIVORE,
-        server_default=DietType.HERBIVORE.value,
+        server_default="herbivore",
     )
     health = db.Column(db.Float, default=100.0)
     energy = db.Column(db.Float, default=100.0)
@@ -206,16 +210,25 @@ class Critter(db.Model):
         self.is_ghost = False
 
     def to_dict(self) -> Dict[str, Any]:
+        return Critter.row_to_dict(
+            {column.name: getattr(self, column.name) for column in self.__table__.columns}
+        )
+
+    @staticmethod
+    def row_to_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        The to_dict of a critter given its column values, so critters loaded
+        as plain rows can be sent without building Critter objects.
+        """
         data = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
+        for name, value in row.items():
             if isinstance(value, enum.Enum):
-                data[column.name] = value.name if value else None
+                data[name] = value.name if value else None
             else:
-                data[column.name] = value
+                data[name] = value
 
         # Add any non-column properties
-        data["max_health"] = self.max_health
+        data["max_health"] = row["size"] * HEALTH_PER_SIZE_POINT
         return data
 
     def __repr__(self):
@@ -235,7 +248,7 @@ class DeadCritter(db.Model):
 
     # genes snapshot
     diet = db.Column(db.Enum(DietType), nullable=False,
-                     server_default=DietType.HERBIVORE.value)
+                     server_default="herbivore")
     speed = db.Column(db.Float)
     size = db.Column(db.Float)
 
@@ -1,43 +1,117 @@
 import logging
 from typing import List, Optional, Tuple
 
+import numpy as np
+
+from seasons import Season, season_manager
+from simulation.pathfinding_numba import (
+    FOUND,
+    NEED_TILES,
+    OUT_OF_BOUNDS,
+    OVER_BUDGET,
+    SearchState,
+    _NEIGHBORS,
+    _astar_core,
+)
 from simulation.terrain_type import TerrainType
-from simulation.world import BASE_ENERGY_COST_PER_MOVE, World, get_energy_cost
+from simulation.world import TileData, World
 
 MAX_ITERATIONS = 500
 
+# How far beyond the start and end the search area first reaches. The area
+# grows whenever the search needs to look further out.
+INITIAL_SEARCH_MARGIN = 8
+
+# Before searching, the land around the end is flood-filled up to this many
+# tiles. If the fill runs out first, the end is cut off from the start by
+# water and there is no need to search.
+MAX_ENCLOSED_POCKET = 16
 
 logger = logging.getLogger(__name__)
 
 
-class Node:
+class _SearchArea:
     """
-    A helper class representing a single node in an A* search space.
+    The rectangle of the world a search runs over, holding the terrain of
+    the tiles sampled so far. Positions are relative to (min_x, min_y).
     """
 
-    def __init__(
-        self,
-        parent: Optional["Node"] = None,
-        position: Optional[Tuple[int, int]] = None,
-    ):
-        self.parent = parent
-        self.position = position
+    def __init__(self, world: World, min_x: int, min_y: int, width: int, height: int):
+        self.world = world
+        self.min_x = min_x
+        self.min_y = min_y
+        self.known = np.zeros((height, width), dtype=np.bool_)
+        self.water = np.zeros((height, width), dtype=np.bool_)
+        self.heights = np.zeros((height, width), dtype=np.float64)
+
+    def add_tile(self, x: int, y: int, tile: TileData):
+        row, col = y - self.min_y, x - self.min_x
+        self.known[row, col] = True
+        self.water[row, col] = tile.terrain == TerrainType.WATER
+        self.heights[row, col] = tile.height
+
+    def sample_around(self, col: int, row: int):
+        """Samples any unknown tiles in the 3x3 block centred on (col, row)."""
+        for r in range(row - 1, row + 2):
+            for c in range(col - 1, col + 2):
+                if not self.known[r, c]:
+                    x, y = self.min_x + c, self.min_y + r
+                    self.add_tile(x, y, self.world.get_tile(x, y))
+
+    def is_water(self, x: int, y: int) -> bool:
+        """Whether the tile at world position (x, y) is water."""
+        row, col = y - self.min_y, x - self.min_x
+        height, width = self.known.shape
+        if not (0 <= row < height and 0 <= col < width):
+            return self.world.get_tile(x, y).terrain == TerrainType.WATER
+        if not self.known[row, col]:
+            self.add_tile(x, y, self.world.get_tile(x, y))
+        return bool(self.water[row, col])
+
+    def grown(self, margin: int) -> "_SearchArea":
+        """Returns a bigger area around this one, keeping what was sampled."""
+        height, width = self.known.shape
+        area = _SearchArea(
+            self.world,
+            self.min_x - margin,
+            self.min_y - margin,
+            width + 2 * margin,
+            height + 2 * margin,
+        )
+        inner = (slice(margin, margin + height), slice(margin, margin + width))
+        area.known[inner] = self.known
+        area.water[inner] = self.water
+        area.heights[inner] = self.heights
+        return area
+
 
-        # The three A* costs
-        self.g: float = 0.0  # cost from start node to this node
-        self.h: float = 0.0  # heuristic cost from this node to the end
+def _is_enclosed(
+    area: _SearchArea, start_pos: Tuple[int, int], end_pos: Tuple[int, int]
+) -> bool:
+    """
+    Whether the end sits in a small pocket of land that the start is not
+    in, so no path can reach it. Gives up, returning False, once the pocket
+    is bigger than MAX_ENCLOSED_POCKET tiles.
+    """
+    seen = {end_pos}
+    frontier = [end_pos]
+    while frontier:
+        x, y = frontier.pop()
+        for dx, dy in _NEIGHBORS:
+            pos = (x + dx, y + dy)
+            if pos in seen:
+                continue
+            if pos == start_pos:
+                return False
+            if area.is_water(*pos):
+                continue
 
-    @property
-    def f(self) -> float:
-        return self.g + self.h
+            seen.add(pos)
+            if len(seen) > MAX_ENCLOSED_POCKET:
+                return False
+            frontier.append(pos)
 
-    def __eq__(self, other: object) -> bool:
-        """
-        Defines how to check if two nodes are equal
-        """
-        if not isinstance(other, Node):
-            return NotImplemented
-        return self.position == other.position
+    return True
 
 
 def find_path(
@@ -46,109 +120,76 @@ def find_path(
     """
     Finds the least energy-cost path from a start to an end position using A*.
     """
-    start_node = Node(None, start_pos)
     start_tile = world.get_tile(start_pos[0], start_pos[1])
     if start_tile.terrain == TerrainType.WATER:
         raise ValueError(
             f"Pathfinding error: Start position {start_pos} is on unwalkable terrain"
         )
 
-    end_node = Node(None, end_pos)
     end_tile = world.get_tile(end_pos[0], end_pos[1])
     if end_tile.terrain == TerrainType.WATER:
         raise ValueError(
             f"Pathfinding error: End position {end_pos} is on unwalkable terrain"
         )
 
-    open_list: List[Node] = [start_node]
-    closed_set: set[Tuple[int, int]] = set()
-
-    iteration_count = 0
-
-    while len(open_list) > 0:
-        # Check before we exceed our computation budget.
-        if iteration_count > MAX_ITERATIONS:
-            # The path is too complex, give up.
-            logger.warning(f"Pathfinding from {start_pos} to {end_pos} exceeded budget")
-            return None
-
-        iteration_count += 1
-
-        current_node = min(open_list, key=lambda node: node.f)
-        current_tile = world.get_tile(
-            current_node.position[0], current_node.position[1]
+    season_scale = 2.0 if season_manager.season == Season.WINTER else 1.0
+
+    area = _SearchArea(
+        world,
+        min(start_pos[0], end_pos[0]) - INITIAL_SEARCH_MARGIN,
+        min(start_pos[1], end_pos[1]) - INITIAL_SEARCH_MARGIN,
+        abs(start_pos[0] - end_pos[0]) + 2 * INITIAL_SEARCH_MARGIN + 1,
+        abs(start_pos[1] - end_pos[1]) + 2 * INITIAL_SEARCH_MARGIN + 1,
+    )
+    area.add_tile(*start_pos, start_tile)
+    area.add_tile(*end_pos, end_tile)
+    search = SearchState(*area.known.shape)
+    grown = False
+
+    while True:
+        status, path = _astar_core(
+            area.known,
+            area.water,
+            area.heights,
+            search.g,
+            search.f,
+            search.seq,
+            search.parent,
+            search.closed,
+            search.heap,
+            search.heap_pos,
+            search.counters,
+            start_pos[0] - area.min_x,
+            start_pos[1] - area.min_y,
+            end_pos[0] - area.min_x,
+            end_pos[1] - area.min_y,
+            season_scale,
+            MAX_ITERATIONS,
         )
 
-        open_list.remove(current_node)
-        closed_set.add(current_node.position)
-
-        if current_node == end_node:
-            path = []
-            current = current_node
-            while current is not None:
-                path.append(current.position)
-                current = current.parent
-            # reverse the path before returning
-            return path[::-1]
-
-        for new_position in [
-            (0, -1),
-            (0, 1),
-            (-1, 0),
-            (1, 0),
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
-        ]:
-            node_position = (
-                current_node.position[0] + new_position[0],
-                current_node.position[1] + new_position[1],
-            )
-
-            # Do not pathfind into water
-            neighbor_tile = world.get_tile(node_position[0], node_position[1])
-            if neighbor_tile.terrain == TerrainType.WATER:
-                continue
-
-            child = Node(current_node, node_position)
-            if child.position in closed_set:
-                continue
-
-            child_tile = world.get_tile(child.position[0], child.position[1])
-
-            # the g_cost is the cost to the parent + the cost of the next step,
-            # which is given by moving in the world.
-            energy_cost = get_energy_cost(current_tile, child_tile)
-
-            child.g = current_node.g + energy_cost
-
-            # h_cost is an estimate of the remaining cost
-            # Option 1: safe and simple
-            # child.h = ((child.position[0] - end_node.position[0]) ** 2) + ((child.position[1] - end_node.position[1]) ** 2)
-
-            # Option 2: factor in energy.  possibly inadmissable.
-            # Calculate the straight-line distance
-            distance = ((child.position[0] - end_node.position[0]) ** 2) + (
-                (child.position[1] - end_node.position[1]) ** 2
-            )
-
-            # Calculate the energy cost as if we teleported from start to end
-            teleport_cost = get_energy_cost(child_tile, end_tile)
-
-            child.h = (distance * BASE_ENERGY_COST_PER_MOVE) + (
-                teleport_cost - BASE_ENERGY_COST_PER_MOVE
-            )
-
-            existing_node_found = False
-            for i, open_node in enumerate(open_list):
-                if open_node == child:
-                    existing_node_found = True
-                    if child.g < open_node.g:
-                        open_list[i] = child
-                    break
-
-            if not existing_node_found:
-                open_list.append(child)
-
-    return None
+        if status == NEED_TILES:
+            area.sample_around(int(path[0, 0]), int(path[0, 1]))
+        elif status == OUT_OF_BOUNDS:
+            # A search for an end it cannot reach only stops once it runs out
+            # of budget, so check for that before it spreads any further.
+            # Searches that finish in the first area never pay for this.
+            if not grown and _is_enclosed(area, start_pos, end_pos):
+                return None
+            grown = True
+
+            # Double the area and start the search again; the tiles already
+            # sampled are kept.
+            area = area.grown(max(area.known.shape))
+            search = SearchState(*area.known.shape)
+        else:
+            break
+
+    if status == OVER_BUDGET:
+        # The path is too complex, give up.
+        logger.warning(f"Pathfinding from {start_pos} to {end_pos} exceeded budget")
+        return None
+
+    if status != FOUND:
+        return None
+
+    return [(int(x) + area.min_x, int(y) + area.min_y) for x, y in path]
@@ -0,0 +1,291 @@
+"""
+Compiled A* search over a rectangle of the world that is sampled as the
+search goes.
+"""
+
+import os
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+from simulation.world import (
+    BASE_ENERGY_COST_PER_MOVE,
+    DOWNHILL_ENERGY_MULTIPLIER,
+    UPHILL_ENERGY_MULTIPLIER,
+)
+
+# Results of _astar_core.
+FOUND = 0
+NO_PATH = 1
+OVER_BUDGET = 2
+# The search wanted to look at a tile outside the sampled rectangle.
+OUT_OF_BOUNDS = 3
+# The search paused until the neighbours of a node are sampled.
+NEED_TILES = 4
+
+# (dx, dy) of each neighbour, in the order they are visited, which decides
+# between equal paths. A constant tuple, so the loops over it are unrolled.
+_NEIGHBORS = (
+    (0, -1),
+    (0, 1),
+    (-1, 0),
+    (1, 0),
+    (-1, -1),
+    (-1, 1),
+    (1, -1),
+    (1, 1),
+)
+
+
+@njit(cache=True)
+def _energy_cost(start_height: float, end_height: float, season_scale: float) -> float:
+    """Mirrors world.get_energy_cost for two heights."""
+    height_diff = end_height - start_height
+    energy_cost = BASE_ENERGY_COST_PER_MOVE
+
+    if height_diff > 0:
+        energy_cost += height_diff * UPHILL_ENERGY_MULTIPLIER
+    elif height_diff < 0:
+        energy_cost += height_diff * DOWNHILL_ENERGY_MULTIPLIER
+
+    return energy_cost * season_scale
+
+
+@njit(cache=True)
+def _before(a: int, b: int, f: np.ndarray, seq: np.ndarray) -> bool:
+    """Whether cell `a` comes off the open set before cell `b`."""
+    return f[a] < f[b] or (f[a] == f[b] and seq[a] < seq[b])
+
+
+@njit(cache=True)
+def _swap(heap: np.ndarray, heap_pos: np.ndarray, i: int, j: int):
+    heap[i], heap[j] = heap[j], heap[i]
+    heap_pos[heap[i]] = i
+    heap_pos[heap[j]] = j
+
+
+@njit(cache=True)
+def _sift_up(heap, heap_pos, f, seq, i: int):
+    while i > 0:
+        parent = (i - 1) // 2
+        if not _before(heap[i], heap[parent], f, seq):
+            break
+        _swap(heap, heap_pos, i, parent)
+        i = parent
+
+
+@njit(cache=True)
+def _sift_down(heap, heap_pos, f, seq, size: int, i: int):
+    while True:
+        smallest = i
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < size and _before(heap[child], heap[smallest], f, seq):
+                smallest = child
+        if smallest == i:
+            break
+        _swap(heap, heap_pos, i, smallest)
+        i = smallest
+
+
+@njit(cache=True)
+def _heap_push(heap, heap_pos, f, seq, size: int, cell: int) -> int:
+    heap[size] = cell
+    heap_pos[cell] = size
+    _sift_up(heap, heap_pos, f, seq, size)
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap, heap_pos, f, seq, size: int) -> int:
+    """Removes the first cell from the heap and returns the new size."""
+    size -= 1
+    heap_pos[heap[0]] = -1
+    if size > 0:
+        heap[0] = heap[size]
+        heap_pos[heap[0]] = 0
+        _sift_down(heap, heap_pos, f, seq, size, 0)
+    return size
+
+
+class SearchState:
+    """
+    Everything _astar_core needs to pause for more tiles and carry on where
+    it left off, for a search over a `height` x `width` rectangle.
+    """
+
+    def __init__(self, height: int, width: int):
+        n_cells = height * width
+        self.g = np.full(n_cells, np.inf)
+        self.f = np.full(n_cells, np.inf)
+        self.seq = np.zeros(n_cells, dtype=np.int64)
+        self.parent = np.full(n_cells, -1, dtype=np.int64)
+        self.closed = np.zeros(n_cells, dtype=np.bool_)
+
+        # The open set, as a binary heap of cells. Each cell knows where it
+        # is in the heap (or -1) so its key can be decreased in place.
+        self.heap = np.empty(n_cells, dtype=np.int64)
+        self.heap_pos = np.full(n_cells, -1, dtype=np.int64)
+
+        # Heap size, next insertion number and iterations used so far.
+        self.counters = np.zeros(3, dtype=np.int64)
+
+
+@njit(cache=True)
+def _astar_core(
+    known: np.ndarray,
+    water: np.ndarray,
+    heights: np.ndarray,
+    g: np.ndarray,
+    f: np.ndarray,
+    seq: np.ndarray,
+    parent: np.ndarray,
+    closed: np.ndarray,
+    heap: np.ndarray,
+    heap_pos: np.ndarray,
+    counters: np.ndarray,
+    sx: int,
+    sy: int,
+    ex: int,
+    ey: int,
+    season_scale: float,
+    max_iterations: int,
+) -> Tuple[int, np.ndarray]:
+    """
+    Runs A* from (sx, sy) to (ex, ey) over grids indexed [y, x], returning
+    a status and, if one was FOUND, the path as an (n, 2) array of (x, y).
+
+    Tiles are sampled lazily: before expanding a node whose neighbours are
+    not all `known`, the search returns NEED_TILES with that node's (x, y).
+    Calling again with the same arrays once they are filled in resumes it.
+
+    The open set is ordered by f and then by when each tile was first
+    opened; improving a tile's g keeps its place in that order. This picks
+    the same node as a scan of an insertion-ordered open list.
+    """
+    height, width = water.shape
+    empty = np.empty((0, 2), dtype=np.int64)
+
+    start = sy * width + sx
+    end = ey * width + ex
+    end_height = heights[ey, ex]
+
+    size, next_seq, iteration_count = counters[0], counters[1], counters[2]
+    if next_seq == 0:
+        g[start] = 0.0
+        f[start] = 0.0
+        next_seq = 1
+        size = _heap_push(heap, heap_pos, f, seq, 0, start)
+
+    while size > 0:
+        if iteration_count > max_iterations:
+            return OVER_BUDGET, empty
+
+        current = heap[0]
+        cx = current % width
+        cy = current // width
+
+        if current != end:
+            if cx < 1 or cy < 1 or cx >= width - 1 or cy >= height - 1:
+                return OUT_OF_BOUNDS, empty
+            for dx, dy in _NEIGHBORS:
+                if not known[cy + dy, cx + dx]:
+                    counters[0], counters[1], counters[2] = size, next_seq, iteration_count
+                    result = np.empty((1, 2), dtype=np.int64)
+                    result[0, 0] = cx
+                    result[0, 1] = cy
+                    return NEED_TILES, result
+
+        size = _heap_pop(heap, heap_pos, f, seq, size)
+        iteration_count += 1
+        closed[current] = True
+
+        if current == end:
+            length = 0
+            cell = current
+            while cell >= 0:
+                length += 1
+                cell = parent[cell]
+            path = np.empty((length, 2), dtype=np.int64)
+            cell = current
+            for i in range(length - 1, -1, -1):
+                path[i, 0] = cell % width
+                path[i, 1] = cell // width
+                cell = parent[cell]
+            return FOUND, path
+
+        current_height = heights[cy, cx]
+
+        for dx, dy in _NEIGHBORS:
+            nx = cx + dx
+            ny = cy + dy
+
+            # Do not pathfind into water
+            if water[ny, nx]:
+                continue
+
+            cell = ny * width + nx
+            if closed[cell]:
+                continue
+
+            child_height = heights[ny, nx]
+            child_g = g[current] + _energy_cost(current_height, child_height, season_scale)
+
+            is_open = heap_pos[cell] >= 0
+            if is_open and not child_g < g[cell]:
+                continue
+
+            distance = (nx - ex) ** 2 + (ny - ey) ** 2
+            teleport_cost = _energy_cost(child_height, end_height, season_scale)
+            child_h = (distance * BASE_ENERGY_COST_PER_MOVE) + (
+                teleport_cost - BASE_ENERGY_COST_PER_MOVE
+            )
+
+            g[cell] = child_g
+            f[cell] = child_g + child_h
+            parent[cell] = current
+
+            if is_open:
+                _sift_up(heap, heap_pos, f, seq, heap_pos[cell])
+            else:
+                seq[cell] = next_seq
+                next_seq += 1
+                size = _heap_push(heap, heap_pos, f, seq, size, cell)
+
+    return NO_PATH, empty
+
+
+def warm_up():
+    """
+    Compiles the search kernel, or loads it from numba's on-disk cache, so
+    the first real search does not pay for it.
+    """
+    known = np.ones((3, 3), dtype=np.bool_)
+    water = np.zeros((3, 3), dtype=np.bool_)
+    heights = np.zeros((3, 3), dtype=np.float64)
+    search = SearchState(3, 3)
+    _astar_core(
+        known,
+        water,
+        heights,
+        search.g,
+        search.f,
+        search.seq,
+        search.parent,
+        search.closed,
+        search.heap,
+        search.heap_pos,
+        search.counters,
+        1,
+        1,
+        1,
+        1,
+        1.0,
+        1,
+    )
+
+
+# Set this to compile at import time rather than on the first search, e.g.
+# once in CI so later runs find the kernel already in __pycache__.
+if os.environ.get("CRITTERS_WARMUP_PATHFINDING"):
+    warm_up()
@@ -3,10 +3,18 @@ import random
 from simulation.models import Critter, DietType
 
 
+def _num(value: float) -> str:
+    """Formats an SVG number to at most two decimal places, e.g. 50 or 12.5."""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
 def generate_svg(critter: Critter) -> str:
     """
     Takes a Critter and returns a string containing a
-    complete procedurally generated SVG based on genetic traits
+    complete procedurally generated SVG based on genetic traits.
+    Numbers are written to at most two decimal places, as any more precision
+    is invisible at this size and only makes the SVG bigger.
     """
     # Size affects the overall scale of the body and head.
     body_width = 35 + (critter.size * 3)
@@ -50,7 +58,7 @@ def generate_svg(critter: Critter) -> str:
             spot_cx = center + dist_x
             spot_cy = center + dist_y
             spot_elements.append(
-                f'<circle cx="{spot_cx}" cy="{spot_cy}" r="{spot_radius}" fill="{accent_color}" />'
+                f'<circle cx="{_num(spot_cx)}" cy="{_num(spot_cy)}" r="{_num(spot_radius)}" fill="{accent_color}" />'
             )
 
         accent_element = "".join(spot_elements)
@@ -62,10 +70,10 @@ def generate_svg(critter: Critter) -> str:
         # Create the accent stripe element for the carnivore
         accent_element = f"""
     <rect 
-        x="{center - body_width/3}" 
-        y="{center + body_height/5}" 
-        width="{3*body_width/4}" 
-        height="{body_height/3}" 
+        x="{_num(center - body_width/3)}" 
+        y="{_num(center + body_height/5)}" 
+        width="{_num(3*body_width/4)}" 
+        height="{_num(body_height/3)}" 
         fill="{accent_color}" 
         rx="8" 
     />
@@ -79,28 +87,28 @@ def generate_svg(critter: Critter) -> str:
 <svg width="100" height="100" viewBox="0 0 {canvas_size} {canvas_size}" xmlns="http://www.w3.org/2000/svg">
     <rect width="{canvas_size}" height="{canvas_size}" fill="#FFFFFF" />
 
-    <rect x="{center - body_width/4}" y="{center + body_height/2 - 5}" width="8" height="{leg_height}" fill="#585858" />
-    <rect x="{center + body_width/4 - 8}" y="{center + body_height/2 - 5}" width="8" height="{leg_height}" fill="#585858" />
+    <rect x="{_num(center - body_width/4)}" y="{_num(center + body_height/2 - 5)}" width="8" height="{_num(leg_height)}" fill="#585858" />
+    <rect x="{_num(center + body_width/4 - 8)}" y="{_num(center + body_height/2 - 5)}" width="8" height="{_num(leg_height)}" fill="#585858" />
 
     <rect 
-        x="{center - body_width/2}" y="{center - body_height/2}" 
-        width="{body_width}" height="{body_height}" 
+        x="{_num(center - body_width/2)}" y="{_num(center - body_height/2)}" 
+        width="{_num(body_width)}" height="{_num(body_height)}" 
         fill="{body_color}" 
         stroke="#333" stroke-width="1" rx="15"
     />
     
     {accent_element}
 
-    <circle cx="{center + body_width/2}" cy="{center}" r="{head_radius}" fill="{body_color}" stroke="#333" stroke-width="1" />
+    <circle cx="{_num(center + body_width/2)}" cy="{_num(center)}" r="{_num(head_radius)}" fill="{body_color}" stroke="#333" stroke-width="1" />
 
     <line 
-        x1="{center + body_width/2}" y1="{center}" 
-        x2="{center + body_width/2 + antenna_length}" y2="{center - antenna_length}" 
+        x1="{_num(center + body_width/2)}" y1="{_num(center)}" 
+        x2="{_num(center + body_width/2 + antenna_length)}" y2="{_num(center - antenna_length)}" 
         stroke="#333" stroke-width="1.5" 
-        transform="rotate({-10 + critter.speed}, {center + body_width/2}, {center})" 
+        transform="rotate({_num(-10 + critter.speed)}, {_num(center + body_width/2)}, {_num(center)})" 
     />
     
-    <circle cx="{center + body_width/2 + head_radius/3}" cy="{center - 2}" r="3" fill="{eye_color}" />
+    <circle cx="{_num(center + body_width/2 + head_radius/3)}" cy="{_num(center - 2)}" r="3" fill="{eye_color}" />
 </svg>
 """
     return svg.replace("\n", "").replace("    ", "")
@@ -0,0 +1,190 @@
+import logging
+import math
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from simulation.models import Critter
+
+# Coordinates are shifted by this much so they are non-negative before their
+# bits are interleaved.
+COORDINATE_OFFSET = 1 << 31
+
+_EVEN_BITS = 0x5555555555555555
+
+# Queries re-sort the index once more critters have moved since it was last
+# sorted than this many, or this fraction of them, whichever is larger.
+MAX_UNSORTED_MOVES = 32
+MAX_UNSORTED_FRACTION = 0.125
+
+logger = logging.getLogger(__name__)
+
+
+def _spread_bits(v):
+    """
+    Spreads the low 32 bits of v out so there is a zero between each bit.
+    Works on ints and on numpy uint64 arrays.
+    """
+    v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v << 2)) & 0x3333333333333333
+    v = (v | (v << 1)) & 0x5555555555555555
+    return v
+
+
+def morton(x: int, y: int) -> int:
+    """Returns the z-order (Morton) code of a world position."""
+    return _spread_bits(x + COORDINATE_OFFSET) | (
+        _spread_bits(y + COORDINATE_OFFSET) << 1
+    )
+
+
+def _bigmin(zval: int, zmin: int, zmax: int) -> int:
+    """
+    Returns the smallest z-value greater than zval that lies inside the box
+    spanned by zmin and zmax (Tropf and Herzog's BIGMIN).
+    """
+    bigmin = zmin
+    for bit in range(63, -1, -1):
+        mask = 1 << bit
+        # The lower bits belonging to the same dimension as this one.
+        lower = (_EVEN_BITS << (bit & 1)) & (mask - 1)
+
+        v = zval & mask
+        lo = zmin & mask
+        hi = zmax & mask
+
+        if not v and not lo and hi:
+            bigmin = (zmin | mask) & ~lower
+            zmax = (zmax & ~mask) | lower
+        elif not v and lo and hi:
+            return zmin
+        elif v and not lo and not hi:
+            return bigmin
+        elif v and not lo and hi:
+            zmin = (zmin | mask) & ~lower
+
+    return bigmin
+
+
+class SpatialIndex:
+    """
+    A z-order index over critter positions for answering "who is within
+    this square?" without scanning every critter.
+
+    Moves are not sorted in straight away. A moved critter's row is set
+    aside and checked directly by queries, until so many have moved that
+    the next query re-sorts the whole index.
+    """
+
+    def __init__(self, critters: Sequence[Critter]):
+        self._critters = critters
+        # The row of each critter in the indexed list, by id.
+        self._rows: Dict[int, int] = {c.id: row for row, c in enumerate(critters)}
+
+        # Current positions, by row.
+        self._x = np.fromiter((c.x for c in critters), dtype=np.int64, count=len(critters))
+        self._y = np.fromiter((c.y for c in critters), dtype=np.int64, count=len(critters))
+        self._sort()
+
+    def _sort(self):
+        """Sorts every row by the z-value of its current position."""
+        zvals = _spread_bits((self._x + COORDINATE_OFFSET).astype(np.uint64)) | (
+            _spread_bits((self._y + COORDINATE_OFFSET).astype(np.uint64)) << 1
+        )
+
+        order = np.argsort(zvals, kind="stable")
+        self._zvals = zvals[order]
+        self._xs: List[int] = self._x[order].tolist()
+        self._ys: List[int] = self._y[order].tolist()
+        self._ids: List[int] = order.tolist()
+        # Rows that have moved since they were sorted.
+        self._moved: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def query(self, x: int, y: int, radius: float) -> List[Critter]:
+        """
+        Returns the critters within `radius` of (x, y) on both axes, in the
+        order they appear in the indexed list.
+        """
+        return [self._critters[idx] for idx in self.query_ids(x, y, radius)]
+
+    def query_ids(self, x: int, y: int, radius: float) -> np.ndarray:
+        """
+        Returns the positions in the indexed list of the critters within
+        `radius` of (x, y) on both axes, in ascending order.
+        """
+        if len(self._moved) > max(MAX_UNSORTED_MOVES, len(self._ids) * MAX_UNSORTED_FRACTION):
+            self._sort()
+
+        r = int(math.floor(radius))
+        min_x, max_x = x - r, x + r
+        min_y, max_y = y - r, y + r
+        zmin = morton(min_x, min_y)
+        zmax = morton(max_x, max_y)
+
+        # Codes use all 64 bits, so always search with explicit uint64s;
+        # plain ints that large would be compared as floats.
+        zvals = self._zvals
+        xs, ys, ids = self._xs, self._ys, self._ids
+        moved = self._moved
+        i = int(np.searchsorted(zvals, np.uint64(zmin), side="left"))
+        end = int(np.searchsorted(zvals, np.uint64(zmax), side="right"))
+
+        found = []
+        while i < end:
+            if min_x <= xs[i] <= max_x and min_y <= ys[i] <= max_y:
+                # Moved rows are no longer where they were sorted.
+                if ids[i] not in moved:
+                    found.append(ids[i])
+                i += 1
+            else:
+                # Left the box; jump to the next z-value that re-enters it.
+                next_z = _bigmin(int(zvals[i]), zmin, zmax)
+                i += max(1, int(np.searchsorted(zvals[i:end], np.uint64(next_z), side="left")))
+
+        if moved:
+            rows = np.fromiter(moved, dtype=np.intp, count=len(moved))
+            inside = (np.abs(self._x[rows] - x) <= r) & (np.abs(self._y[rows] - y) <= r)
+            found.extend(rows[inside].tolist())
+
+        found.sort()
+        return np.array(found, dtype=np.intp)
+
+    def update(self, critter: Critter):
+        """Moves an indexed critter to its current position."""
+        row = self._rows[critter.id]
+        self._x[row] = critter.x
+        self._y[row] = critter.y
+        self._moved.add(row)
+
+
+# The index for the critter list currently being simulated.
+_cached_critters: Optional[Sequence[Critter]] = None
+_cached_index: Optional[SpatialIndex] = None
+
+
+def get_index(critters: Sequence[Critter]) -> SpatialIndex:
+    """
+    Returns the spatial index for a list of critters, building it the first
+    time the list is seen.
+    """
+    global _cached_critters, _cached_index
+    if (
+        _cached_critters is not critters
+        or _cached_index is None
+        or len(_cached_index) != len(critters)
+    ):
+        _cached_critters = critters
+        _cached_index = SpatialIndex(critters)
+        logger.debug(f"Built spatial index for {len(critters)} critters")
+    return _cached_index
+
+
+def critter_moved(critters: Sequence[Critter], critter: Critter):
+    """Keeps the index for `critters`, if there is one, in step with a move."""
+    if _cached_critters is critters and _cached_index is not None:
+        _cached_index.update(critter)
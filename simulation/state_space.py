@@ -29,20 +29,13 @@ def get_state_for_critter(critter: Critter, world: World, all_critters: List[Cri
 
     # --- 2. External State (What the critter sees) ---
     local_dim = int((SENSE_RADIUS * 2) + 1)
-    height_map = np.zeros((local_dim, local_dim), dtype=np.float32)
-    grass_map = np.zeros((local_dim, local_dim), dtype=np.float32)
-    water_map = np.zeros((local_dim, local_dim), dtype=np.float32)
+    min_x, min_y = critter.x - SENSE_RADIUS, critter.y - SENSE_RADIUS
+    heights, terrain = world.get_tile_slab(min_x, min_y, local_dim, local_dim)
+    food = world.get_food_slab(min_x, min_y, terrain)
 
-    for y_offset in range(-SENSE_RADIUS, SENSE_RADIUS + 1):
-        for x_offset in range(-SENSE_RADIUS, SENSE_RADIUS + 1):
-            array_y, array_x = y_offset + SENSE_RADIUS, x_offset + SENSE_RADIUS
-            wx, wy = critter.x + x_offset, critter.y + y_offset
-            tile = world.get_tile(wx, wy)
-            height_map[array_y, array_x] = tile.height
-            if tile.terrain == TerrainType.GRASS:
-                grass_map[array_y, array_x] = tile.food_available / 10.0
-            elif tile.terrain == TerrainType.WATER:
-                water_map[array_y, array_x] = 1.0
+    height_map = heights.astype(np.float32)
+    grass_map = np.where(terrain == TerrainType.GRASS.value, food / 10.0, 0.0).astype(np.float32)
+    water_map = (terrain == TerrainType.WATER.value).astype(np.float32)
 
     perception = math.ceil(critter.perception)
     # --- Information about other critters ---
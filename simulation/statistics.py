@@ -1,16 +1,54 @@
 import json
 import logging
-import math
-from typing import Dict
+from typing import Any, Dict
 import numpy as np
 
 from simulation.agent import DQNAgent
 from simulation.models import Critter, DietType, SimulationStats, TrainingStats
+from sqlalchemy import Integer, case, cast, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
+def _floor(column):
+    """
+    SQL floor() for float columns. SQLite only ships floor() when built with
+    its optional math functions, so build it from a cast instead.
+    """
+    truncated = cast(column, Integer)
+    return case((column < truncated, truncated - 1), else_=truncated)
+
+
+def _get_distributions(session: Session) -> Dict[DietType, Dict[str, Dict[int, int]]]:
+    """
+    Bins age, hunger, thirst and energy for both diets in a single query.
+    Returns {diet: {trait: {bin: count}}}.
+    """
+    trait_bins = {
+        "ages": Critter.age,
+        "hunger": _floor(Critter.hunger),
+        "thirst": _floor(Critter.thirst),
+        "energy": _floor(Critter.energy),
+    }
+
+    query = union_all(
+        *[
+            select(literal(trait), Critter.diet, bin_expr, func.count())
+            .group_by(Critter.diet, bin_expr)
+            for trait, bin_expr in trait_bins.items()
+        ]
+    )
+
+    distributions: Dict[DietType, Dict[str, Dict[int, int]]] = {
+        diet: {trait: {} for trait in trait_bins} for diet in DietType
+    }
+    for trait, diet, bin_value, count in session.execute(query):
+        distributions[diet][trait][int(bin_value)] = count
+
+    return distributions
+
+
 def _get_percentiles(critter_list, trait_name):
     if not critter_list:
         return None, None, None
@@ -28,21 +66,17 @@ def record_statistics(session: Session, tick: int, world_tick: int):
         logger.warning("No living critters")
         return
 
-    herbivore_stats = {
+    distributions = _get_distributions(session)
+
+    herbivore_stats: Dict[str, Any] = {
         "count": 0,
-        "ages": {},
         "health": {"Healthy": 0, "Hurt": 0, "Critical": 0},
-        "hunger": {},
-        "thirst": {},
-        "energy": {},
+        **distributions[DietType.HERBIVORE],
     }
-    carnivore_stats = {
+    carnivore_stats: Dict[str, Any] = {
         "count": 0,
-        "ages": {},
         "health": {"Healthy": 0, "Hurt": 0, "Critical": 0},
-        "hunger": {},
-        "thirst": {},
-        "energy": {},
+        **distributions[DietType.CARNIVORE],
     }
 
     goal_bins = {}
@@ -54,17 +88,6 @@ def record_statistics(session: Session, tick: int, world_tick: int):
 
         stats_dict["count"] += 1
 
-        stats_dict["ages"][c.age] = stats_dict["ages"].get(c.age, 0) + 1
-        hunger_bin = int(math.floor(c.hunger))
-        stats_dict["hunger"][hunger_bin] = stats_dict["hunger"].get(
-            hunger_bin, 0) + 1
-        thirst_bin = int(math.floor(c.thirst))
-        stats_dict["thirst"][thirst_bin] = stats_dict["thirst"].get(
-            thirst_bin, 0) + 1
-        energy_bin = int(math.floor(c.energy))
-        stats_dict["energy"][energy_bin] = stats_dict["energy"].get(
-            energy_bin, 0) + 1
-
         if c.health > 70:
             stats_dict["health"]["Healthy"] += 1
         elif c.health > 30:
@@ -154,8 +177,9 @@ def record_statistics(session: Session, tick: int, world_tick: int):
     )
     session.add(stats)
 
-    logger.info(
-        f"  Recorded stats for tick {tick} ({world_tick}): {stats.to_dict()}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"  Recorded stats for tick {tick} ({world_tick}): {stats.to_dict()}")
 
 
 def record_training_statistics(
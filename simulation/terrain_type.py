@@ -1,8 +1,10 @@
 import enum
 
 
+# The values are the codes terrain is stored as in numpy arrays. Compare
+# those arrays against TerrainType.<member>.value.
 class TerrainType(enum.Enum):
-    WATER = "water"
-    GRASS = "grass"
-    DIRT = "dirt"
-    MOUNTAIN = "mountain"
+    WATER = 1
+    GRASS = 2
+    DIRT = 3
+    MOUNTAIN = 4
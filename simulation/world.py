@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Tuple
 import noise
+import numpy as np
 
 from sqlalchemy.orm import Session
 
@@ -32,11 +33,20 @@ DEFAULT_GRASS_FOOD = 10.0
 MAX_SEED_VALUE = 1024
 WORLD_CHUNK_SIZE = 32
 
+# How many chunks of generated terrain to keep. They are shared by every
+# World with the same seed, and each one takes about 9KB.
+MAX_CACHED_CHUNKS = 1024
+
+# get_terrain_at reads tiles from the chunks, rather than generating them,
+# as long as their bounding box is at most this many times their number.
+MAX_SLAB_SPREAD = 4
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class TileData:
+# Tiles are created for every lookup, so keep them small, immutable and
+# cheap to build.
+class TileData(NamedTuple):
     x: int
     y: int
     terrain: TerrainType
@@ -63,18 +73,78 @@ def get_energy_cost(start_tile: TileData, end_tile: TileData) -> float:
     return energy_cost
 
 
+_TERRAIN_BY_VALUE = {terrain.value: terrain for terrain in TerrainType}
+
+
+def _generate_terrain(
+    seed: int, xs: np.ndarray, ys: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the heights and terrain (as TerrainType values) of the tiles at
+    (xs, ys), in the same shape as the inputs.
+    """
+    heights = np.fromiter(
+        (
+            noise.pnoise2(
+                x / HEIGHT_SCALE,
+                y / HEIGHT_SCALE,
+                octaves=HEIGHT_OCTAVES,
+                persistence=HEIGHT_PERSISTENCE,
+                lacunarity=HEIGHT_LACUNARITY,
+                base=seed,
+            )
+            for x, y in zip(np.ravel(xs).tolist(), np.ravel(ys).tolist())
+        ),
+        dtype=np.float64,
+        count=np.size(xs),
+    ).reshape(np.shape(xs)) * 1.5
+
+    terrain = np.select(
+        [
+            heights < WATER_LEVEL,
+            heights < DIRT_TO_GRASS_LEVEL,
+            heights >= MOUNTAIN_LEVEL,
+        ],
+        [TerrainType.WATER.value, TerrainType.DIRT.value, TerrainType.MOUNTAIN.value],
+        default=TerrainType.GRASS.value,
+    ).astype(np.uint8)
+
+    return heights, terrain
+
+
+@lru_cache(maxsize=MAX_CACHED_CHUNKS)
+def _procedural_chunk(seed: int, chunk_x: int, chunk_y: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The heights and terrain of every tile in a chunk, indexed
+    [y - chunk_y * WORLD_CHUNK_SIZE, x - chunk_x * WORLD_CHUNK_SIZE].
+    """
+    min_x = chunk_x * WORLD_CHUNK_SIZE
+    min_y = chunk_y * WORLD_CHUNK_SIZE
+    ys, xs = np.mgrid[min_y : min_y + WORLD_CHUNK_SIZE, min_x : min_x + WORLD_CHUNK_SIZE]
+    heights, terrain = _generate_terrain(seed, xs, ys)
+
+    # Shared between worlds, so make sure nothing writes to them.
+    heights.flags.writeable = False
+    terrain.flags.writeable = False
+
+    logger.debug(f"Generated chunk ({chunk_x}, {chunk_y})")
+    return heights, terrain
+
+
 class World:
     """
     Represents the game world, procedural generating terrain
-    on the fly.  Nothing is stored in memory.
+    on the fly.  The generated heights and terrain are kept as arrays per
+    chunk, shared by every World with the same seed.
     """
 
     def __init__(self, seed: int, session: Session):
         """Initializes the world with a seed for the noise functions."""
         self.seed = seed % MAX_SEED_VALUE
         self.session = session
-        # Store loaded chunks
-        # Format: {(chunk_x, chunk_y): {(tile_x, tile_y): TileState, ...}}
+        # The saved food of each loaded chunk, as an array indexed like
+        # _procedural_chunk's, with NaN for tiles that have no saved state.
+        # Format: {(chunk_x, chunk_y): np.ndarray}
         self._chunk_cache = {}
 
     def get_tile(self, x: int, y: int) -> TileData:
@@ -85,13 +155,186 @@ class World:
         if (chunk_x, chunk_y) not in self._chunk_cache:
             self._load_chunk(chunk_x, chunk_y)
 
-        base_tile = self._generate_procedural_tile(x, y)
+        heights, terrain = _procedural_chunk(self.seed, chunk_x, chunk_y)
+        row = y - chunk_y * WORLD_CHUNK_SIZE
+        col = x - chunk_x * WORLD_CHUNK_SIZE
+        tile_terrain = _TERRAIN_BY_VALUE[terrain.item(row, col)]
+
+        food_available = self._chunk_cache[(chunk_x, chunk_y)].item(row, col)
+        if food_available != food_available:  # NaN: no saved state
+            food_available = DEFAULT_GRASS_FOOD if tile_terrain == TerrainType.GRASS else 0
+
+        return TileData(x, y, tile_terrain, heights.item(row, col), food_available)
+
+    def get_terrain(self, x: int, y: int) -> TerrainType:
+        """The terrain of a tile, without building a TileData."""
+        chunk_x = x // WORLD_CHUNK_SIZE
+        chunk_y = y // WORLD_CHUNK_SIZE
+        _, terrain = _procedural_chunk(self.seed, chunk_x, chunk_y)
+        return _TERRAIN_BY_VALUE[
+            terrain.item(y - chunk_y * WORLD_CHUNK_SIZE, x - chunk_x * WORLD_CHUNK_SIZE)
+        ]
+
+    def get_height(self, x: int, y: int) -> float:
+        """The height of a tile, without building a TileData."""
+        chunk_x = x // WORLD_CHUNK_SIZE
+        chunk_y = y // WORLD_CHUNK_SIZE
+        heights, _ = _procedural_chunk(self.seed, chunk_x, chunk_y)
+        return heights.item(y - chunk_y * WORLD_CHUNK_SIZE, x - chunk_x * WORLD_CHUNK_SIZE)
+
+    def get_tile_slab(
+        self, min_x: int, min_y: int, width: int, height: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the heights and terrain (as TerrainType values) of a
+        rectangle of tiles in one go, as arrays indexed [y - min_y, x - min_x].
+        """
+        heights = np.empty((height, width), dtype=np.float64)
+        terrain = np.empty((height, width), dtype=np.uint8)
+
+        max_x = min_x + width
+        max_y = min_y + height
+        for chunk_y in range(min_y // WORLD_CHUNK_SIZE, (max_y - 1) // WORLD_CHUNK_SIZE + 1):
+            for chunk_x in range(min_x // WORLD_CHUNK_SIZE, (max_x - 1) // WORLD_CHUNK_SIZE + 1):
+                chunk_heights, chunk_terrain = _procedural_chunk(self.seed, chunk_x, chunk_y)
+
+                # The part of the slab inside this chunk, in world coordinates.
+                x0 = max(min_x, chunk_x * WORLD_CHUNK_SIZE)
+                x1 = min(max_x, (chunk_x + 1) * WORLD_CHUNK_SIZE)
+                y0 = max(min_y, chunk_y * WORLD_CHUNK_SIZE)
+                y1 = min(max_y, (chunk_y + 1) * WORLD_CHUNK_SIZE)
+
+                slab = (slice(y0 - min_y, y1 - min_y), slice(x0 - min_x, x1 - min_x))
+                chunk = (
+                    slice(y0 - chunk_y * WORLD_CHUNK_SIZE, y1 - chunk_y * WORLD_CHUNK_SIZE),
+                    slice(x0 - chunk_x * WORLD_CHUNK_SIZE, x1 - chunk_x * WORLD_CHUNK_SIZE),
+                )
+                heights[slab] = chunk_heights[chunk]
+                terrain[slab] = chunk_terrain[chunk]
+
+        return heights, terrain
+
+    def get_food_slab(self, min_x: int, min_y: int, terrain: np.ndarray) -> np.ndarray:
+        """
+        Returns the food on each tile of a slab, given its terrain from
+        get_tile_slab, indexed the same way.
+        """
+        height, width = terrain.shape
+        food = np.where(terrain == TerrainType.GRASS.value, DEFAULT_GRASS_FOOD, 0.0)
+
+        max_x = min_x + width
+        max_y = min_y + height
+        for chunk_y in range(min_y // WORLD_CHUNK_SIZE, (max_y - 1) // WORLD_CHUNK_SIZE + 1):
+            for chunk_x in range(min_x // WORLD_CHUNK_SIZE, (max_x - 1) // WORLD_CHUNK_SIZE + 1):
+                if (chunk_x, chunk_y) not in self._chunk_cache:
+                    self._load_chunk(chunk_x, chunk_y)
+
+                # The part of the slab inside this chunk, in world coordinates.
+                x0 = max(min_x, chunk_x * WORLD_CHUNK_SIZE)
+                x1 = min(max_x, (chunk_x + 1) * WORLD_CHUNK_SIZE)
+                y0 = max(min_y, chunk_y * WORLD_CHUNK_SIZE)
+                y1 = min(max_y, (chunk_y + 1) * WORLD_CHUNK_SIZE)
+
+                saved = self._chunk_cache[(chunk_x, chunk_y)][
+                    y0 - chunk_y * WORLD_CHUNK_SIZE : y1 - chunk_y * WORLD_CHUNK_SIZE,
+                    x0 - chunk_x * WORLD_CHUNK_SIZE : x1 - chunk_x * WORLD_CHUNK_SIZE,
+                ]
+                np.copyto(
+                    food[y0 - min_y : y1 - min_y, x0 - min_x : x1 - min_x],
+                    saved,
+                    where=~np.isnan(saved),
+                )
+
+        return food
+
+    def get_tiles(self, xs: np.ndarray, ys: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Returns the "height", "terrain" (as TerrainType values) and
+        "food_available" of the tiles at (xs, ys), as arrays shaped like xs.
+        """
+        heights, terrain = self.get_terrain_at(xs, ys)
+        return {
+            "height": heights,
+            "terrain": terrain,
+            "food_available": self.get_food_at(xs, ys, terrain),
+        }
+
+    def get_terrain_at(
+        self, xs: np.ndarray, ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the heights and terrain (as TerrainType values) of the tiles
+        at (xs, ys), as arrays shaped like xs.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if xs.size == 0:
+            return np.empty(xs.shape, dtype=np.float64), np.empty(xs.shape, dtype=np.uint8)
+
+        min_x, min_y = int(xs.min()), int(ys.min())
+        width = int(xs.max()) + 1 - min_x
+        height = int(ys.max()) + 1 - min_y
+
+        if width * height > MAX_SLAB_SPREAD * xs.size:
+            # Spread thinly over a large area, so generate just these tiles
+            # rather than every chunk they fall in.
+            return _generate_terrain(self.seed, xs, ys)
+
+        # Close together, so read them from the cached chunks.
+        heights, terrain = self.get_tile_slab(min_x, min_y, width, height)
+        index = (ys - min_y, xs - min_x)
+        return heights[index], terrain[index]
+
+    def get_food_at(
+        self, xs: np.ndarray, ys: np.ndarray, terrain: np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns the food on the tiles at (xs, ys), given their terrain from
+        get_terrain_at, as an array shaped like xs.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        food = np.where(terrain == TerrainType.GRASS.value, DEFAULT_GRASS_FOOD, 0.0)
+        if xs.size == 0:
+            return food
+
+        min_x, max_x = int(xs.min()), int(xs.max())
+        min_y, max_y = int(ys.min()), int(ys.max())
+        overrides = (
+            self.session.query(TileState.x, TileState.y, TileState.food_available)
+            .filter(TileState.x.between(min_x, max_x), TileState.y.between(min_y, max_y))
+            .all()
+        )
+        if not overrides:
+            return food
 
-        saved_state = self._chunk_cache[(chunk_x, chunk_y)].get((x, y))
-        if saved_state:
-            base_tile.food_available = saved_state.food_available
+        override_x, override_y, override_food = (np.array(c) for c in zip(*overrides))
 
-        return base_tile
+        # Match overrides to tiles by a single key per position.
+        height = max_y + 1 - min_y
+        keys = (xs - min_x).ravel() * height + (ys - min_y).ravel()
+        override_keys = (override_x - min_x) * height + (override_y - min_y)
+        order = np.argsort(keys)
+        found = np.searchsorted(keys[order], override_keys).clip(max=keys.size - 1)
+        matches = keys[order][found] == override_keys
+        food.ravel()[order[found[matches]]] = override_food[matches]
+
+        return food
+
+    def update_food(self, x: int, y: int, food_available: float):
+        """
+        Records new food on a tile whose saved state was loaded, so later
+        lookups agree with the TileState the change was written to.
+        """
+        chunk_x = x // WORLD_CHUNK_SIZE
+        chunk_y = y // WORLD_CHUNK_SIZE
+        saved = self._chunk_cache.get((chunk_x, chunk_y))
+        if saved is None:
+            return
+
+        index = (y - chunk_y * WORLD_CHUNK_SIZE, x - chunk_x * WORLD_CHUNK_SIZE)
+        if not np.isnan(saved[index]):
+            saved[index] = food_available
 
     def _load_chunk(self, chunk_x: int, chunk_y: int):
         """
@@ -103,20 +346,30 @@ class World:
         min_y = chunk_y * WORLD_CHUNK_SIZE
         max_y = min_y + (WORLD_CHUNK_SIZE - 1)
 
+        # Just the columns, so no TileState objects are built.
         overrides_list = (
-            self.session.query(TileState)
+            self.session.query(TileState.x, TileState.y, TileState.food_available)
             .filter(
                 TileState.x.between(min_x, max_x), TileState.y.between(min_y, max_y)
             )
             .all()
         )
 
-        chunk_data = {(tile.x, tile.y): tile for tile in overrides_list}
+        chunk_data = np.full((WORLD_CHUNK_SIZE, WORLD_CHUNK_SIZE), np.nan)
+        if overrides_list:
+            xs, ys, food = (np.array(column) for column in zip(*overrides_list))
+            chunk_data[ys - min_y, xs - min_x] = food
 
         self._chunk_cache[(chunk_x, chunk_y)] = chunk_data
 
         logger.debug(f"Loaded chunk ({chunk_x}, {chunk_y})")
 
+    def _generate_procedural_tiles(
+        self, xs: np.ndarray, ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched version of _generate_procedural_tile."""
+        return _generate_terrain(self.seed, xs, ys)
+
     def _generate_procedural_tile(self, x: int, y: int) -> TileData:
         """The core generation logic."""
         height_val = (
@@ -1,18 +1,23 @@
 import unittest
-import sys
-import os
-import random
+import itertools
 
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.behaviours.breeding import BreedingBehavior
 from simulation.models import AIState, DietType
 from simulation.action_type import ActionType
 
 
+_GRASS_TILE = TileData(
+    x=0, y=0, terrain=TerrainType.GRASS, height=0.0, food_available=1.0
+)
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
 # --- Mock Objects for Testing ---
 class MockCritter:
     """A fake Critter for testing breeding logic."""
@@ -29,7 +34,7 @@ class MockCritter:
         cooldown=0,
         ai_state=AIState.IDLE,
     ):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.diet = diet
@@ -45,10 +50,9 @@ class MockWorld:
     """A mock world that provides height and energy cost for pathfinding."""
 
     def get_tile(self, x, y) -> TileData:
-        # For these tests, we can assume all tiles are flat land
-        return TileData(
-            x=x, y=y, terrain=TerrainType.GRASS, height=0.0, food_available=1.0
-        )
+        # For these tests, we can assume all tiles are flat land. Pathfinding
+        # only reads terrain and height, so one shared tile will do.
+        return _GRASS_TILE
 
 
 class TestBreeding(unittest.TestCase):
@@ -1,16 +1,11 @@
-# tests/test_behaviors.py
+# tests/behaviours/test_fleeing.py
 
-import random
+import itertools
 import unittest
-import sys
 from typing import List, Tuple
-import os
 
 from simulation.world import TileData
 
-# Add the project root to the Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
 from simulation.behaviours.fleeing import FleeingBehavior
 from simulation.models import DietType
@@ -19,12 +14,23 @@ from simulation.terrain_type import TerrainType
 # --- Mock Objects for Testing ---
 # We create simple fake objects to simulate the real ones for our tests.
 
+_GRASS_TILE = TileData(
+    x=0, y=0, terrain=TerrainType.GRASS, height=0.0, food_available=1.0
+)
+_WATER_TILE = TileData(
+    x=0, y=0, terrain=TerrainType.WATER, height=0.0, food_available=0.0
+)
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
 
 class MockCritter:
     """A fake Critter for testing purposes."""
 
     def __init__(self, x, y, diet):
-        self.id = random.randint(1, 1000)  # Give it a random ID
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.diet = diet
@@ -39,13 +45,10 @@ class MockWorld:
         self.water_locations = water_locations
 
     def get_tile(self, x, y) -> TileData:
-        if (x, y) in self.water_locations:
-            return TileData(
-                x=x, y=y, terrain=TerrainType.WATER, height=0.0, food_available=0.0
-            )
-        return TileData(
-            x=x, y=y, terrain=TerrainType.GRASS, height=0.0, food_available=1.0
-        )
+        # Fleeing picks its escape tile by position, so stamp the coordinates
+        # onto the shared template tile.
+        tile = _WATER_TILE if (x, y) in self.water_locations else _GRASS_TILE
+        return tile._replace(x=x, y=y)
 
 
 class TestFleeing(unittest.TestCase):
@@ -112,5 +115,3 @@ class TestFleeing(unittest.TestCase):
 
 
 # This allows you to run the tests directly with 'python tests/test_behaviors.py'
-if __name__ == "__main__":
-    unittest.main()
@@ -1,27 +1,31 @@
-# tests/test_moving_behaviors.py
+# tests/behaviours/test_flocking.py
 
 import unittest
-import sys
-import os
-import random
+import itertools
 
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-# Add the project root to the Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
 from simulation.behaviours.flocking import FlockingBehavior
 from simulation.models import AIState, DietType
 
 
+_GRASS_TILE = TileData(
+    x=0, y=0, terrain=TerrainType.GRASS, height=0.0, food_available=1.0
+)
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
 # --- Mock Objects for Testing ---
 class MockCritter:
     """A fake Critter for testing movement behaviors."""
 
     def __init__(self, x, y, vx, vy, diet, ai_state=AIState.IDLE):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.vx = vx
@@ -34,9 +38,8 @@ class MockWorld:
     """A fake world with limited functionality"""
 
     def get_tile(self, x, y) -> TileData:
-        return TileData(
-            x=x, y=y, terrain=TerrainType.GRASS, height=y, food_available=1.0
-        )
+        # Flocking (and its wandering fallback) only checks terrain.
+        return _GRASS_TILE
 
 
 class TestFlockingBehavior(unittest.TestCase):
@@ -121,8 +124,3 @@ class TestFlockingBehavior(unittest.TestCase):
         # It is ignoring the separation rule and still applying cohesion.
         self.assertIsNotNone(action)
         self.assertGreater(action.dx, 0)
-
-
-# This allows you to run the tests directly
-if __name__ == "__main__":
-    unittest.main()
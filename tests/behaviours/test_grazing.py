@@ -1,16 +1,13 @@
-# tests/test_behaviors.py
+# tests/behaviours/test_grazing.py
 
-import random
+import itertools
 import unittest
-import sys
-import os
+
+import numpy as np
 
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-# Add the project root to the Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
 from simulation.behaviours.grazing import MINIMUM_GRAZE_AMOUNT, GrazingBehavior
 from simulation.models import DietType
@@ -19,11 +16,15 @@ from simulation.models import DietType
 # We create simple fake objects to simulate the real ones for our tests.
 
 
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
 class MockCritter:
     """A fake Critter for testing purposes."""
 
     def __init__(self, x, y, diet=DietType.HERBIVORE):
-        self.id = random.randint(1, 1000)  # Give it a random ID
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.diet = diet
@@ -35,16 +36,35 @@ class MockWorld:
     def __init__(self, food_locations):
         # food_locations should be a dict like {(x, y): amount}
         self.food_locations = food_locations
+        # Tiles are a pure function of position, so build each one once.
+        self._tiles = {}
 
     def get_tile(self, x, y) -> TileData:
-        food_amount = self.food_locations.get((x, y), 0.0)
-        return TileData(
-            x=x,
-            y=y,
-            terrain=TerrainType.GRASS,
-            food_available=food_amount,
-            height=y,
-        )
+        tile = self._tiles.get((x, y))
+        if tile is None:
+            food_amount = self.food_locations.get((x, y), 0.0)
+            tile = TileData(
+                x=x,
+                y=y,
+                terrain=TerrainType.GRASS,
+                food_available=food_amount,
+                height=y,
+            )
+            self._tiles[(x, y)] = tile
+        return tile
+
+    def get_tile_slab(self, min_x, min_y, width, height):
+        ys, xs = np.mgrid[min_y : min_y + height, min_x : min_x + width]
+        terrain = np.full((height, width), TerrainType.GRASS.value, dtype=np.uint8)
+        return ys.astype(np.float64), terrain
+
+    def get_food_slab(self, min_x, min_y, terrain):
+        food = np.zeros(terrain.shape)
+        for (x, y), amount in self.food_locations.items():
+            row, col = y - min_y, x - min_x
+            if 0 <= row < food.shape[0] and 0 <= col < food.shape[1]:
+                food[row, col] = amount
+        return food
 
 
 class TestBehaviors(unittest.TestCase):
@@ -96,8 +116,3 @@ class TestBehaviors(unittest.TestCase):
 
         # Assert: No action should be taken as the food is not worth it
         self.assertIsNone(action)
-
-
-# This allows you to run the tests directly with 'python tests/test_behaviors.py'
-if __name__ == "__main__":
-    unittest.main()
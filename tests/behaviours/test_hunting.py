@@ -1,18 +1,20 @@
-# tests/test_hunting.py
+# tests/behaviours/test_hunting.py
 
+import copy
+import functools
 import unittest
-import sys
-import os
-import random
+import itertools
 
 from simulation.brain import HUNGER_TO_START_AMBUSHING, HUNGER_TO_START_HUNTING
 from simulation.world import TileData
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
-from simulation.behaviours.hunting import HuntingBehavior
-from simulation.models import DietType
+from simulation.behaviours.hunting import SMALL_POPULATION, HuntingBehavior
+from simulation.models import AIState, DietType
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
 
 
 class MockCritter:
@@ -24,8 +26,9 @@ class MockCritter:
         health=100.0,
         is_ghost=False,
         hunger=HUNGER_TO_START_HUNTING + 1,
+        ai_state=AIState.IDLE,
     ):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.diet = diet
@@ -36,6 +39,14 @@ class MockCritter:
         self.is_ghost = is_ghost
         self.perception = 8.0
         self.hunger = hunger
+        self.ai_state = ai_state
+        self.breeding_cooldown = 0
+
+
+@functools.cache
+def _make_tile(x, y, terrain, food, height):
+    """Returns one shared TileData per distinct set of fields."""
+    return TileData(x=x, y=y, terrain=terrain, food_available=food, height=height)
 
 
 class MockWorld:
@@ -44,14 +55,18 @@ class MockWorld:
     def get_tile(self, x, y):
         # For this test, we'll just say there's food at (1, 1)
         has_food = 10.0 if x == 1 and y == 1 else 0.0
-        return TileData(x=x, y=y, terrain="grass", food_available=has_food, height=y)
+        return _make_tile(x, y, "grass", has_food, y)
 
 
 class TestHuntingBehavior(unittest.TestCase):
 
-    def setUp(self):
-        self.carnivore = MockCritter(x=0, y=0, diet=DietType.CARNIVORE)
-        self.world = MockWorld()
+    @classmethod
+    def setUpClass(cls):
+        # None of these are modified by the tests; tests that need a different
+        # carnivore copy the template.
+        cls.world = MockWorld()
+        cls.behavior = HuntingBehavior()
+        cls.carnivore_template = MockCritter(x=0, y=0, diet=DietType.CARNIVORE)
 
     def test_ignores_ghost_prey(self):
         """
@@ -63,10 +78,9 @@ class TestHuntingBehavior(unittest.TestCase):
         # A healthy, living prey that is further away
         living_prey = MockCritter(x=4, y=4, diet=DietType.HERBIVORE, is_ghost=False)
 
-        all_critters = [self.carnivore, ghost_prey, living_prey]
+        all_critters = [self.carnivore_template, ghost_prey, living_prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(self.carnivore_template, self.world, all_critters)
 
         # Assert: The carnivore should ignore the ghost and target the living prey
         self.assertIsNotNone(action)
@@ -79,10 +93,9 @@ class TestHuntingBehavior(unittest.TestCase):
         weaker_distant_prey = MockCritter(
             x=4, y=4, diet=DietType.HERBIVORE, health=20.0
         )
-        all_critters = [self.carnivore, adjacent_prey, weaker_distant_prey]
+        all_critters = [self.carnivore_template, adjacent_prey, weaker_distant_prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(self.carnivore_template, self.world, all_critters)
 
         self.assertIsNotNone(action)
         self.assertEqual(action.type, ActionType.ATTACK)
@@ -94,10 +107,9 @@ class TestHuntingBehavior(unittest.TestCase):
             x=2, y=2, diet=DietType.HERBIVORE, health=100.0
         )
         weak_far_prey = MockCritter(x=4, y=4, diet=DietType.HERBIVORE, health=20.0)
-        all_critters = [self.carnivore, healthy_close_prey, weak_far_prey]
+        all_critters = [self.carnivore_template, healthy_close_prey, weak_far_prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(self.carnivore_template, self.world, all_critters)
 
         self.assertIsNotNone(action)
         self.assertEqual(action.type, ActionType.MOVE)
@@ -107,34 +119,44 @@ class TestHuntingBehavior(unittest.TestCase):
         """If multiple prey have the same health, it should target the closest one."""
         close_prey = MockCritter(x=2, y=2, diet=DietType.HERBIVORE, health=50.0)
         far_prey = MockCritter(x=4, y=4, diet=DietType.HERBIVORE, health=50.0)
-        all_critters = [self.carnivore, far_prey, close_prey]
+        all_critters = [self.carnivore_template, far_prey, close_prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(self.carnivore_template, self.world, all_critters)
 
         self.assertIsNotNone(action)
         self.assertEqual(action.type, ActionType.MOVE)
         self.assertEqual(action.target, (close_prey.x, close_prey.y))
 
     def test_returns_none_if_no_prey_in_range(self):
-        """If there are no herbivores in sensing range, it should return None."""
-        all_critters = [self.carnivore]
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        """
+        If there are no herbivores in sensing range and the carnivore is not
+        yet hungry enough to lie in wait, it should return None.
+        """
+        carnivore = copy.copy(self.carnivore_template)
+        carnivore.hunger = HUNGER_TO_START_AMBUSHING - 1
+        action = self.behavior.get_action(carnivore, self.world, [carnivore])
         self.assertIsNone(action)
 
+    def test_ambushes_when_hungry_and_no_prey_in_range(self):
+        """A hungry carnivore with nothing to hunt lies in wait instead."""
+        all_critters = [self.carnivore_template]
+        action = self.behavior.get_action(self.carnivore_template, self.world, all_critters)
+
+        self.assertIsNotNone(action)
+        self.assertEqual(action.type, ActionType.AMBUSH)
+
     def test_ambushes_when_moderately_hungry_and_no_prey_near(self):
         """
         Tests that a moderately hungry carnivore will AMBUSH if no prey is in its kill zone.
         """
+        carnivore = copy.copy(self.carnivore_template)
         # Set hunger to be in the "ambush" range
-        self.carnivore.hunger = HUNGER_TO_START_AMBUSHING + 1
+        carnivore.hunger = HUNGER_TO_START_AMBUSHING + 1
         # Place prey far away, outside the ambush radius
         prey = MockCritter(x=10, y=10, diet=DietType.HERBIVORE)
-        all_critters = [self.carnivore, prey]
+        all_critters = [carnivore, prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(carnivore, self.world, all_critters)
 
         # Assert: The action should be to wait and ambush
         self.assertIsNotNone(action)
@@ -145,13 +167,13 @@ class TestHuntingBehavior(unittest.TestCase):
         Tests that a moderately hungry carnivore will MOVE to intercept prey
         that enters its ambush "kill zone".
         """
-        self.carnivore.hunger = HUNGER_TO_START_AMBUSHING + 1
+        carnivore = copy.copy(self.carnivore_template)
+        carnivore.hunger = HUNGER_TO_START_AMBUSHING + 1
         # Place prey close by, inside the ambush radius but not adjacent
         prey = MockCritter(x=2, y=2, diet=DietType.HERBIVORE)
-        all_critters = [self.carnivore, prey]
+        all_critters = [carnivore, prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(carnivore, self.world, all_critters)
 
         # Assert: The action should be to MOVE towards the nearby prey
         self.assertIsNotNone(action)
@@ -163,16 +185,37 @@ class TestHuntingBehavior(unittest.TestCase):
         Tests that a very hungry carnivore will ignore the ambush tactic and
         perform a long-range hunt.
         """
+        carnivore = copy.copy(self.carnivore_template)
         # Set hunger to be in the "active hunt" range
-        self.carnivore.hunger = HUNGER_TO_START_HUNTING + 1
-        # Place prey far away, outside the ambush radius but inside the main sense radius
-        prey = MockCritter(x=8, y=8, diet=DietType.HERBIVORE)
-        all_critters = [self.carnivore, prey]
+        carnivore.hunger = HUNGER_TO_START_HUNTING + 1
+        # Place prey outside the ambush radius but inside the main sense radius,
+        # and close enough that a rested carnivore will commit to the chase.
+        prey = MockCritter(x=6, y=0, diet=DietType.HERBIVORE)
+        all_critters = [carnivore, prey]
 
-        behavior = HuntingBehavior()
-        action = behavior.get_action(self.carnivore, self.world, all_critters)
+        action = self.behavior.get_action(carnivore, self.world, all_critters)
 
         # Assert: The action should be to MOVE towards the distant prey
         self.assertIsNotNone(action)
         self.assertEqual(action.type, ActionType.MOVE)
         self.assertEqual(action.target, (prey.x, prey.y))
+
+    def test_large_population_picks_same_target(self):
+        """
+        Populations too big for the scalar fast path are scored with numpy,
+        and must pick the same prey.
+        """
+        weak_prey = MockCritter(x=4, y=4, diet=DietType.HERBIVORE, health=20.0)
+        healthy_prey = MockCritter(x=2, y=2, diet=DietType.HERBIVORE, health=100.0)
+        small = [self.carnivore_template, healthy_prey, weak_prey]
+        # Other carnivores are never prey, so they only change the code path.
+        large = small + [
+            MockCritter(x=-i, y=i, diet=DietType.CARNIVORE)
+            for i in range(SMALL_POPULATION)
+        ]
+
+        small_action = self.behavior.get_action(self.carnivore_template, self.world, small)
+        large_action = self.behavior.get_action(self.carnivore_template, self.world, large)
+
+        self.assertEqual(large_action, small_action)
+        self.assertEqual(large_action.target, (weak_prey.x, weak_prey.y))
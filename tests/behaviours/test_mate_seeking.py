@@ -1,22 +1,23 @@
-# tests/test_mate_seeking.py
+# tests/behaviours/test_mate_seeking.py
 
+import functools
 import unittest
-import sys
-import os
-import random
+import itertools
 
 from simulation.world import TileData
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
 from simulation.behaviours.mate_seeking import MateSeekingBehavior
-from simulation.models import DietType
+from simulation.models import AIState, DietType
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
 
 
 class MockCritter:
     def __init__(self, x, y, diet, health=100.0, hunger=0.0, thirst=0.0, cooldown=0):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.y = y
         self.diet = diet
@@ -24,6 +25,16 @@ class MockCritter:
         self.hunger = hunger
         self.thirst = thirst
         self.breeding_cooldown = cooldown
+        self.max_health = 100.0
+        self.energy = 100.0
+        self.is_ghost = False
+        self.ai_state = AIState.IDLE
+
+
+@functools.cache
+def _make_tile(x, y, terrain, food, height):
+    """Returns one shared TileData per distinct set of fields."""
+    return TileData(x=x, y=y, terrain=terrain, food_available=food, height=height)
 
 
 class MockWorld:
@@ -33,13 +44,7 @@ class MockWorld:
         # For this test, we'll just say there's food at (1, 1)
         has_food = 10.0 if x == 1 and y == 1 else 0.0
         # Also just set the height to be the same as y
-        return TileData(
-            x=x,
-            y=y,
-            terrain="grass",
-            food_available=has_food,
-            height=y,
-        )
+        return _make_tile(x, y, "grass", has_food, y)
 
 
 class TestMateSeekingBehavior(unittest.TestCase):
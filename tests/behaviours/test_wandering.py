@@ -1,27 +1,31 @@
-# tests/test_moving_behaviors.py
+# tests/behaviours/test_wandering.py
 
-import unittest
-import sys
-import os
 import random
+import unittest
+import itertools
+from unittest import mock
+
+import numpy as np
 
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-# Add the project root to the Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
+from simulation.behaviours import wandering
 from simulation.behaviours.wandering import WanderingBehavior
 from simulation.models import DietType
 
 
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
 # --- Mock Objects for Testing ---
 class MockCritter:
     """A fake Critter for testing movement behaviors."""
 
     def __init__(self, x, y, vx, vy, diet):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.vx = vx
         self.y = y
@@ -29,17 +33,31 @@ class MockCritter:
         self.diet = diet
 
 
+# The region around the origin the mock world can hold water in.
+_WORLD_RADIUS = 10
+
+# Wandering only looks at terrain, so every tile can share one of these.
+_GRASS_TILE = TileData(x=0, y=0, terrain=TerrainType.GRASS, height=0.0, food_available=1.0)
+_WATER_TILE = TileData(x=0, y=0, terrain=TerrainType.WATER, height=0.0, food_available=0.0)
+
+
 class MockWorld:
     """A fake world.  No logic required"""
 
     def __init__(self, water_locations=None):
-        self.water_locations = water_locations if water_locations else set()
+        size = 2 * _WORLD_RADIUS + 1
+        self._water = np.zeros((size, size), dtype=bool)
+        for x, y in water_locations or ():
+            self._water[y + _WORLD_RADIUS, x + _WORLD_RADIUS] = True
 
     def get_tile(self, x, y):
-        terrain = TerrainType.GRASS
-        if (x, y) in self.water_locations:
-            terrain = TerrainType.WATER
-        return TileData(x=x, y=y, terrain=terrain, height=y, food_available=1.0)
+        if (
+            abs(x) <= _WORLD_RADIUS
+            and abs(y) <= _WORLD_RADIUS
+            and self._water[y + _WORLD_RADIUS, x + _WORLD_RADIUS]
+        ):
+            return _WATER_TILE
+        return _GRASS_TILE
 
 
 class TestWanderingBehavior(unittest.TestCase):
@@ -69,18 +87,57 @@ class TestWanderingBehavior(unittest.TestCase):
         # This critter has momentum moving right (vx=1)
         critter = MockCritter(x=0, y=0, vx=1, vy=0, diet=DietType.CARNIVORE)
         world = MockWorld()
-        behavior = WanderingBehavior()
-
-        # Run the action many times. Due to the high probability of continuing,
+        # Draw many moves at once. Due to the high probability of continuing,
         # the vast majority of moves should be to the right.
-        right_moves = 0
-        for _ in range(100):
-            action = behavior.get_action(critter, world, [])
-            if action.dx > 0:
-                right_moves += 1
+        dxs, _ = WanderingBehavior.sample_dx_dy(critter, world, 100)
 
         # Assert that the critter continued its momentum most of the time
-        self.assertGreater(right_moves, 70)  # Should be ~80, so >70 is a safe bet
+        self.assertGreater((dxs > 0).sum(), 70)  # Should be ~90, so >70 is a safe bet
+
+    def test_get_action_keeps_momentum_unless_direction_changes(self):
+        """
+        get_action keeps the critter's velocity when its draw is above the
+        change probability, and otherwise picks one of the valid directions.
+        """
+        critter = MockCritter(x=0, y=0, vx=2.0, vy=0.0, diet=DietType.CARNIVORE)
+        world = MockWorld()
+        behavior = WanderingBehavior()
+
+        change = wandering.DIRECTION_CHANGE_PROBABILITY
+        # Keep going, then change direction and take the first valid one.
+        draws = [change + 0.5, change / 2, 0.0]
+        with mock.patch.object(wandering, "_random_buffer", draws), \
+                mock.patch.object(wandering, "_random_pos", 0):
+            kept = behavior.get_action(critter, world, [])
+            changed = behavior.get_action(critter, world, [])
+
+        self.assertEqual((kept.dx, kept.dy), (2.0, 0.0))
+        self.assertEqual((changed.dx, changed.dy), wandering.POSSIBLE_DIRECTIONS[0])
+
+    def test_seeding_random_makes_wandering_reproducible(self):
+        """random.seed() decides the moves, once buffered draws are discarded."""
+        critter = MockCritter(x=0, y=0, vx=1, vy=0, diet=DietType.CARNIVORE)
+        world = MockWorld()
+        behavior = WanderingBehavior()
+
+        def wander():
+            random.seed(7)
+            wandering.reset_random()
+            moves = [behavior.get_action(critter, world, []) for _ in range(50)]
+            batch = WanderingBehavior.sample_dx_dy(critter, world, 50)
+            return [(move.dx, move.dy) for move in moves], [steps.tolist() for steps in batch]
+
+        self.assertEqual(wander(), wander())
+
+    def test_sampled_momentum_steps_match_get_action(self):
+        """Batched steps that keep momentum are the velocity, as get_action's are."""
+        critter = MockCritter(x=0, y=0, vx=2.0, vy=0.0, diet=DietType.CARNIVORE)
+        dxs, dys = WanderingBehavior.sample_dx_dy(critter, MockWorld(), 100)
+
+        self.assertIn(2.0, dxs)
+        self.assertTrue(set(zip(dxs.tolist(), dys.tolist())) <= {
+            (2.0, 0.0), *wandering.POSSIBLE_DIRECTIONS
+        })
 
     def test_random_wandering_avoids_water(self):
         """
@@ -107,8 +164,3 @@ class TestWanderingBehavior(unittest.TestCase):
             # The only possible moves are to the right (1, 0) or to not move (0, 0)
             self.assertIn(action.dx, [0, 1])
             self.assertEqual(action.dy, 0)
-
-
-# This allows you to run the tests directly
-if __name__ == "__main__":
-    unittest.main()
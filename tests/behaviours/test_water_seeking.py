@@ -1,7 +1,7 @@
 import unittest
-import sys
-import os
-import random
+import itertools
+
+import numpy as np
 
 from simulation.behaviours.water_seeking import WaterSeekingBehavior
 from simulation.brain import THIRST_TO_START_DRINKING
@@ -10,18 +10,19 @@ from simulation.models import DietType
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-# Add the project root to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.action_type import ActionType
 
 
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
 # --- Mock Objects for Testing ---
 class MockCritter:
     """A fake Critter for testing purposes."""
 
     def __init__(self, x, y):
-        self.id = random.randint(1, 1000)
+        self.id = _next_id()
         self.x = x
         self.y = y
 
@@ -31,13 +32,27 @@ class MockWorld:
 
     def __init__(self, water_locations=None):
         self.water_locations = water_locations if water_locations is not None else set()
+        # Tiles are a pure function of position, so build each one once.
+        self._tiles = {}
 
     def get_tile(self, x, y):
-        terrain = (
-            TerrainType.WATER if (x, y) in self.water_locations else TerrainType.GRASS
-        )
-        # Pathfinding requires height, so we'll add a default
-        return TileData(x=x, y=y, terrain=terrain, height=0.0, food_available=1.0)
+        tile = self._tiles.get((x, y))
+        if tile is None:
+            terrain = (
+                TerrainType.WATER if (x, y) in self.water_locations else TerrainType.GRASS
+            )
+            # Pathfinding requires height, so we'll add a default
+            tile = TileData(x=x, y=y, terrain=terrain, height=0.0, food_available=1.0)
+            self._tiles[(x, y)] = tile
+        return tile
+
+    def get_tile_slab(self, min_x, min_y, width, height):
+        heights = np.zeros((height, width))
+        terrain = np.full((height, width), TerrainType.GRASS.value, dtype=np.uint8)
+        for x, y in self.water_locations:
+            if min_x <= x < min_x + width and min_y <= y < min_y + height:
+                terrain[y - min_y, x - min_x] = TerrainType.WATER.value
+        return heights, terrain
 
 
 # --- The Tests ---
@@ -0,0 +1,79 @@
+# tests/test_critter_batch.py
+
+import itertools
+import unittest
+
+import numpy as np
+
+from simulation.critter_batch import CritterBatch, critter_changed, get_batch
+from simulation.models import AIState, DietType
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
+class MockCritter:
+    """A fake Critter with every field a batch reads."""
+
+    def __init__(self, x, y, diet=DietType.HERBIVORE):
+        self.id = _next_id()
+        self.x = x
+        self.y = y
+        self.diet = diet
+        self.is_ghost = False
+        self.health = 100.0
+        self.max_health = 100.0
+        self.energy = 100.0
+        self.hunger = 0.0
+        self.thirst = 0.0
+        self.breeding_cooldown = 0
+        self.ai_state = AIState.IDLE
+
+
+class TestCritterBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.critters = [MockCritter(x=i, y=-i) for i in range(5)]
+
+    def test_take_selects_rows_in_order(self):
+        """A sub-batch holds the requested rows and their critters."""
+        batch = CritterBatch.from_critters(self.critters)
+        sub = batch.take(np.array([3, 1]))
+
+        self.assertEqual(sub.critters, [self.critters[3], self.critters[1]])
+        self.assertEqual(sub.xs.tolist(), [3, 1])
+        self.assertEqual(sub.ys.tolist(), [-3, -1])
+
+    def test_changed_critters_are_refreshed(self):
+        """Changes reported for a critter show up in the shared batch."""
+        batch = get_batch(self.critters)
+        critter = self.critters[2]
+        critter.x = 40
+        critter.health = 10.0
+        critter.ai_state = AIState.EATING
+
+        critter_changed(self.critters, critter)
+
+        self.assertIs(get_batch(self.critters), batch)
+        self.assertEqual(batch.xs[2], 40)
+        self.assertEqual(batch.health[2], 10.0)
+        self.assertTrue(batch.distracted[2])
+
+    def test_changed_critters_refresh_only_their_row(self):
+        """critter_changed finds a critter's row by id and leaves the rest alone."""
+        batch = get_batch(self.critters)
+        sub = batch.take(np.array([4, 0]))
+        self.assertEqual(sub.rows, {self.critters[4].id: 0, self.critters[0].id: 1})
+
+        for critter in (self.critters[4], self.critters[0]):
+            critter.hunger = 50.0 + critter.x
+            critter_changed(self.critters, critter)
+
+        self.assertEqual(batch.hunger.tolist(), [50.0, 0.0, 0.0, 0.0, 54.0])
+
+    def test_batch_is_rebuilt_for_a_different_list(self):
+        """The batch is only reused for the list it was built from."""
+        first = get_batch(self.critters)
+        self.assertIs(get_batch(self.critters), first)
+        self.assertIsNot(get_batch(list(self.critters)), first)
@@ -1,17 +1,20 @@
 # tests/test_pathfinding.py
 
+import functools
 import unittest
-import sys
-import os
 
 from simulation.terrain_type import TerrainType
 from simulation.world import TileData
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from simulation.pathfinding import find_path
 
 
+@functools.cache
+def _make_tile(x, y, terrain, food, height):
+    """Returns one shared TileData per distinct set of fields."""
+    return TileData(x=x, y=y, terrain=terrain, food_available=food, height=height)
+
+
 class MockWorld:
     """A mock world that can be configured with obstacles and heights."""
 
@@ -22,7 +25,7 @@ class MockWorld:
     def get_tile(self, x, y) -> TileData:
         terrain = TerrainType.WATER if (x, y) in self.obstacles else TerrainType.GRASS
         height = self.heights.get((x, y), 0.0)  # Default to flat ground
-        return TileData(x=x, y=y, terrain=terrain, height=height, food_available=1.0)
+        return _make_tile(x, y, terrain, 1.0, height)
 
 
 class TestPathfinding(unittest.TestCase):
@@ -97,3 +100,15 @@ class TestPathfinding(unittest.TestCase):
         # The most important check: The second step in the path MUST be (1,1).
         # This proves the algorithm correctly chose the diagonal step first.
         self.assertEqual(path[1], (1, 1))
+
+    def test_returns_none_if_end_is_walled_in(self):
+        """Tests that an end surrounded by water is found to be unreachable."""
+        # A ring of water around a 2x2 island.
+        obstacles = {(x, y) for x in range(4, 8) for y in range(4, 8)}
+        obstacles -= {(5, 5), (5, 6), (6, 5), (6, 6)}
+        world = MockWorld(obstacles=obstacles)
+
+        # Without the early exit the search only gives up once over budget,
+        # which it logs.
+        with self.assertNoLogs("simulation.pathfinding", level="WARNING"):
+            self.assertIsNone(find_path(world, (0, 0), (6, 6)))
@@ -0,0 +1,74 @@
+# tests/test_routes.py
+
+import importlib.util
+import unittest
+
+from config import Config
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    CACHE_TYPE = "SimpleCache"
+    CACHE_OPTIONS = {}
+    TESTING = True
+
+
+# The routes import the simulation engine, which needs tensorflow.
+@unittest.skipUnless(importlib.util.find_spec("tensorflow"), "tensorflow is not installed")
+class TestStatsHistory(unittest.TestCase):
+
+    def setUp(self):
+        from web_server import create_app, db
+
+        self.db = db
+        self.app = create_app(TestConfig)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.next_tick = 1
+
+    def tearDown(self):
+        self.db.session.remove()
+        self.db.drop_all()
+        self.context.pop()
+
+    def add_stats(self, *world_ticks):
+        from simulation.models import SimulationStats
+
+        for world_tick in world_ticks:
+            self.db.session.add(
+                SimulationStats(
+                    tick=self.next_tick,
+                    world_tick=world_tick,
+                    population=self.next_tick,
+                    herbivore_population=0,
+                    carnivore_population=0,
+                )
+            )
+            self.next_tick += 1
+        self.db.session.commit()
+
+    def get_history(self):
+        response = self.client.get("/api/stats/history")
+        self.assertEqual(response.status_code, 200)
+        return [(entry["world_tick"], entry["tick"]) for entry in response.json]
+
+    def test_repeated_world_ticks_are_separate_entries(self):
+        """
+        World ticks go backwards when the population grows, and each run of
+        a world tick is its own entry, cached or not.
+        """
+        self.add_stats(1, 1, 2, 1, 3)
+
+        expected = [(1, 2), (2, 3), (1, 4), (3, 5)]
+        self.assertEqual(self.get_history(), expected)
+        self.assertEqual(self.get_history(), expected)
+
+    def test_latest_run_is_not_cached(self):
+        """The last run keeps growing, even when its world tick is not the highest."""
+        self.add_stats(1, 3, 2)
+        self.assertEqual(self.get_history(), [(1, 1), (3, 2), (2, 3)])
+
+        self.add_stats(2, 1)
+        self.assertEqual(self.get_history(), [(1, 1), (3, 2), (2, 4), (1, 5)])
@@ -0,0 +1,109 @@
+# tests/test_spatial_index.py
+
+import itertools
+import random
+import unittest
+
+from simulation.spatial_index import (
+    MAX_UNSORTED_MOVES,
+    SpatialIndex,
+    _bigmin,
+    get_index,
+    morton,
+)
+
+
+# Unique, deterministic ids for the mock critters.
+_next_id = itertools.count(1).__next__
+
+
+class MockCritter:
+    """A fake Critter with just an id and a position."""
+
+    def __init__(self, x, y):
+        self.id = _next_id()
+        self.x = x
+        self.y = y
+
+
+def _brute_force(critters, x, y, radius):
+    return [c for c in critters if abs(c.x - x) <= radius and abs(c.y - y) <= radius]
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(42)
+        self.critters = [
+            MockCritter(self.rng.randint(-50, 50), self.rng.randint(-50, 50))
+            for _ in range(300)
+        ]
+        self.index = SpatialIndex(self.critters)
+
+    def test_query_matches_linear_scan(self):
+        """Queries, including ones straddling the origin, match a full scan."""
+        for _ in range(200):
+            x = self.rng.randint(-60, 60)
+            y = self.rng.randint(-60, 60)
+            radius = self.rng.choice([0, 1, 2.5, 8, 30])
+            self.assertEqual(
+                self.index.query(x, y, radius),
+                _brute_force(self.critters, x, y, radius),
+            )
+
+    def test_query_after_moves(self):
+        """Updating moved critters keeps query results exact."""
+        for _ in range(100):
+            critter = self.rng.choice(self.critters)
+            critter.x += self.rng.randint(-3, 3)
+            critter.y += self.rng.randint(-3, 3)
+            self.index.update(critter)
+
+        self.assertEqual(
+            self.index.query(0, 0, 10), _brute_force(self.critters, 0, 0, 10)
+        )
+
+    def test_query_ids_after_moves_match_a_fresh_index(self):
+        """
+        query_ids agrees with a newly built index both before and after
+        enough moves pile up to re-sort the index.
+        """
+        for moves in (1, MAX_UNSORTED_MOVES, 5 * MAX_UNSORTED_MOVES):
+            for _ in range(moves):
+                critter = self.rng.choice(self.critters)
+                critter.x += self.rng.randint(-5, 5)
+                critter.y += self.rng.randint(-5, 5)
+                self.index.update(critter)
+
+            fresh = SpatialIndex(self.critters)
+            for _ in range(20):
+                x = self.rng.randint(-60, 60)
+                y = self.rng.randint(-60, 60)
+                radius = self.rng.choice([0, 2, 8, 30])
+                self.assertEqual(
+                    self.index.query_ids(x, y, radius).tolist(),
+                    fresh.query_ids(x, y, radius).tolist(),
+                )
+
+    def test_bigmin_finds_next_code_in_box(self):
+        """BIGMIN returns the smallest in-box z-value after an outside one."""
+        min_x, min_y, max_x, max_y = -3, 2, 5, 9
+        in_box = sorted(
+            morton(x, y)
+            for x in range(min_x, max_x + 1)
+            for y in range(min_y, max_y + 1)
+        )
+        zmin, zmax = morton(min_x, min_y), morton(max_x, max_y)
+
+        for x in range(-10, 12):
+            for y in range(-5, 16):
+                z = morton(x, y)
+                if zmin < z < zmax and z not in in_box:
+                    expected = next(v for v in in_box if v > z)
+                    self.assertEqual(_bigmin(z, zmin, zmax), expected)
+
+    def test_index_is_reused_for_the_same_list(self):
+        """The index is only rebuilt when a different list is passed in."""
+        first = get_index(self.critters)
+        self.assertIs(get_index(self.critters), first)
+        self.assertIsNot(get_index(list(self.critters)), first)
@@ -0,0 +1,89 @@
+# tests/test_statistics.py
+
+import importlib.util
+import unittest
+
+from config import Config
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    CACHE_TYPE = "SimpleCache"
+    CACHE_OPTIONS = {}
+    TESTING = True
+
+
+# The statistics module imports the RL agent, which needs tensorflow.
+@unittest.skipUnless(importlib.util.find_spec("tensorflow"), "tensorflow is not installed")
+class TestDistributions(unittest.TestCase):
+
+    def setUp(self):
+        from web_server import create_app, db
+
+        self.db = db
+        self.app = create_app(TestConfig)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+
+    def tearDown(self):
+        self.db.session.remove()
+        self.db.drop_all()
+        self.context.pop()
+
+    def add_critter(self, diet, age, hunger, thirst, energy):
+        from simulation.models import Critter
+
+        self.db.session.add(
+            Critter(
+                diet=diet, x=0, y=0, speed=1.0, size=1.0, metabolism=1.0,
+                lifespan=600, commitment=1.0, perception=5.0,
+                parent_one_id=0, parent_two_id=0,
+                age=age, hunger=hunger, thirst=thirst, energy=energy,
+            )
+        )
+
+    def test_traits_are_binned_per_diet(self):
+        """Each trait is floored into bins and counted separately per diet."""
+        from simulation.models import DietType
+        from simulation.statistics import _get_distributions
+
+        self.add_critter(DietType.HERBIVORE, age=3, hunger=2.7, thirst=0.0, energy=99.9)
+        self.add_critter(DietType.HERBIVORE, age=3, hunger=2.0, thirst=-0.5, energy=100.0)
+        self.add_critter(DietType.HERBIVORE, age=7, hunger=3.1, thirst=-2.0, energy=100.0)
+        self.add_critter(DietType.CARNIVORE, age=10, hunger=0.4, thirst=5.5, energy=50.5)
+        self.add_critter(DietType.CARNIVORE, age=12, hunger=0.9, thirst=5.0, energy=-0.1)
+        self.db.session.commit()
+
+        distributions = _get_distributions(self.db.session)
+
+        self.assertEqual(
+            distributions[DietType.HERBIVORE],
+            {
+                "ages": {3: 2, 7: 1},
+                "hunger": {2: 2, 3: 1},
+                "thirst": {0: 1, -1: 1, -2: 1},
+                "energy": {99: 1, 100: 2},
+            },
+        )
+        self.assertEqual(
+            distributions[DietType.CARNIVORE],
+            {
+                "ages": {10: 1, 12: 1},
+                "hunger": {0: 2},
+                "thirst": {5: 2},
+                "energy": {50: 1, -1: 1},
+            },
+        )
+
+    def test_no_critters_gives_empty_bins(self):
+        """Every diet and trait is present even with no critters."""
+        from simulation.models import DietType
+        from simulation.statistics import _get_distributions
+
+        distributions = _get_distributions(self.db.session)
+
+        for diet in DietType:
+            self.assertEqual(
+                distributions[diet], {"ages": {}, "hunger": {}, "thirst": {}, "energy": {}}
+            )
@@ -0,0 +1,144 @@
+# tests/test_world.py
+
+import unittest
+
+import numpy as np
+
+from simulation.world import World
+
+
+class MockTileState:
+    def __init__(self, x, y, food_available):
+        self.x = x
+        self.y = y
+        self.food_available = food_available
+
+
+class MockSession:
+    """Returns the tile overrides inside the bounds of each query."""
+
+    def __init__(self, overrides):
+        self.overrides = overrides
+        self.columns = ()
+        self.bounds = {}
+
+    def query(self, *columns):
+        self.columns = columns
+        self.bounds = {}
+        return self
+
+    def filter(self, *clauses):
+        # The world only filters with column.between(low, high).
+        for clause in clauses:
+            low, high = (bound.value for bound in clause.right.clauses)
+            self.bounds[clause.left.name] = (low, high)
+        return self
+
+    def all(self):
+        tiles = [
+            tile
+            for tile in self.overrides
+            if all(low <= getattr(tile, name) <= high for name, (low, high) in self.bounds.items())
+        ]
+        if len(self.columns) > 1:
+            # Queries for (x, y, food_available) columns.
+            return [(tile.x, tile.y, tile.food_available) for tile in tiles]
+        return tiles
+
+
+class TestWorld(unittest.TestCase):
+
+    def setUp(self):
+        # Procedural generation never touches the database.
+        self.world = World(seed=42, session=None)
+
+    def test_batched_generation_matches_single_tiles(self):
+        """Batched tiles are identical to tiles generated one at a time."""
+        ys, xs = np.mgrid[-40:40:3, -250:250:7]
+        heights, terrain = self.world._generate_procedural_tiles(xs, ys)
+
+        self.assertEqual(heights.shape, xs.shape)
+        for x, y, height, kind in zip(
+            xs.ravel(), ys.ravel(), heights.ravel(), terrain.ravel()
+        ):
+            tile = self.world._generate_procedural_tile(int(x), int(y))
+            self.assertEqual(tile.height, height)
+            self.assertEqual(tile.terrain.value, kind)
+
+    def test_tile_slab_is_indexed_by_row_then_column(self):
+        """Slabs hold the tile at (x, y) at [y - min_y, x - min_x]."""
+        heights, terrain = self.world.get_tile_slab(-7, 3, 5, 4)
+
+        self.assertEqual(terrain.shape, (4, 5))
+        for row in range(4):
+            for col in range(5):
+                tile = self.world._generate_procedural_tile(-7 + col, 3 + row)
+                self.assertEqual(heights[row, col], tile.height)
+                self.assertEqual(terrain[row, col], tile.terrain.value)
+
+    def test_tiles_read_from_chunks_match_generation(self):
+        """get_tile and its fast paths agree with the generator, across chunks."""
+        for x, y in [(0, 0), (31, 31), (32, -1), (-33, 64), (-1, -32)]:
+            expected = self.world._generate_procedural_tile(x, y)
+            self.assertEqual(self.world.get_terrain(x, y), expected.terrain)
+            self.assertEqual(self.world.get_height(x, y), expected.height)
+
+    def test_tile_slab_spans_chunks(self):
+        """A slab straddling chunk corners matches tiles read one at a time."""
+        heights, terrain = self.world.get_tile_slab(-40, 20, 80, 20)
+
+        for row in range(0, 20, 3):
+            for col in range(0, 80, 7):
+                self.assertEqual(heights[row, col], self.world.get_height(-40 + col, 20 + row))
+                self.assertEqual(terrain[row, col], self.world.get_terrain(-40 + col, 20 + row).value)
+
+    def test_food_slab_matches_tiles(self):
+        """Food slabs include overrides, just like get_tile."""
+        world = World(seed=42, session=MockSession([MockTileState(3, 4, 2.5)]))
+        _, terrain = world.get_tile_slab(0, 0, 8, 8)
+        food = world.get_food_slab(0, 0, terrain)
+
+        self.assertEqual(food[4, 3], 2.5)
+        for row in range(8):
+            for col in range(8):
+                self.assertEqual(food[row, col], world.get_tile(col, row).food_available)
+
+    def test_get_tiles_matches_get_tile(self):
+        """get_tiles agrees with get_tile for close and widely spaced tiles."""
+        overrides = [MockTileState(0, 0, 2.5), MockTileState(-30, 20, 1.5)]
+        for step in (1, 10):
+            world = World(seed=42, session=MockSession(overrides))
+            ys, xs = np.mgrid[-40:60:step, -30:70:step]
+            tiles = world.get_tiles(xs, ys)
+
+            self.assertEqual(tiles["terrain"].shape, xs.shape)
+            for index in np.ndindex(xs.shape):
+                tile = world.get_tile(int(xs[index]), int(ys[index]))
+                self.assertEqual(tiles["height"][index], tile.height)
+                self.assertEqual(tiles["terrain"][index], tile.terrain.value)
+                self.assertEqual(tiles["food_available"][index], tile.food_available)
+
+    def test_food_slab_spans_chunks(self):
+        """Overrides in every chunk a slab covers are filled in, and no others."""
+        overrides = [
+            MockTileState(-1, -1, 2.5),
+            MockTileState(0, 5, 1.5),
+            MockTileState(40, 5, 0.5),
+        ]
+        world = World(seed=42, session=MockSession(overrides))
+        _, terrain = world.get_tile_slab(-4, -4, 12, 12)
+        food = world.get_food_slab(-4, -4, terrain)
+
+        self.assertEqual(food[3, 3], 2.5)
+        self.assertEqual(food[9, 4], 1.5)
+        for row in range(12):
+            for col in range(12):
+                self.assertEqual(food[row, col], world.get_tile(col - 4, row - 4).food_available)
+
+    def test_update_food_changes_loaded_overrides(self):
+        """Food written back to a saved tile is seen by later lookups."""
+        world = World(seed=42, session=MockSession([MockTileState(3, 4, 2.5)]))
+        self.assertEqual(world.get_tile(3, 4).food_available, 2.5)
+
+        world.update_food(3, 4, 1.0)
+        self.assertEqual(world.get_tile(3, 4).food_available, 1.0)
@@ -1,17 +1,42 @@
 from config import Config
-from flask import Flask
+from flask import Flask, Response
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+import orjson
 
 
 db = SQLAlchemy()
 migrate = Migrate()
+cache = Cache()
+
+
+class OrjsonProvider(JSONProvider):
+    """Encodes and decodes JSON, including every jsonify response, with orjson."""
+
+    # Keys are sorted, as by Flask's default provider.
+    OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # Sends the encoded bytes as they are, rather than through a str.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.OPTIONS), mimetype="application/json"
+        )
 
 
 def create_app(config_class=Config):
     """App factory"""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
 
     # Import models from the simulation package HERE.
     # This makes them available to Flask-SQLAlchemy and Flask-Migrate.
@@ -19,6 +44,7 @@ def create_app(config_class=Config):
 
     db.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
 
     from web_server.routes import main as main_bp
 
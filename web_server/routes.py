@@ -1,8 +1,13 @@
 from collections import Counter
+import gzip
 from itertools import groupby
 import json
-from flask import Response, request, jsonify, Blueprint, render_template
-from sqlalchemy import func
+import numpy as np
+import orjson
+from typing import Any, Dict, List, Tuple
+from flask import Response, abort, request, jsonify, Blueprint, render_template
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import joinedload
 from config import Config
 from simulation.brain import (
     CRITICAL_ENERGY,
@@ -24,8 +29,9 @@ from simulation.models import (
 from simulation.engine import DEFAULT_GRASS_FOOD, MAX_ENERGY, MAX_HUNGER, MAX_THIRST
 
 from simulation.renderer import generate_svg
-from simulation.world import World
-from web_server import db
+from simulation.terrain_type import TerrainType
+from simulation.world import WORLD_CHUNK_SIZE, World
+from web_server import cache, db
 from flask import current_app as app
 
 
@@ -34,6 +40,51 @@ main = Blueprint("main", __name__)
 
 CANVAS_SIZE = 600
 
+# Terrain views are sampled down to at most this many tiles along each side.
+MAX_TILES_PER_SIDE = 200
+# Terrain views wider or taller than this are refused.
+MAX_VIEW_SIZE = 5000
+# How long every client is sent the same death counts. Deaths are written by
+# the simulation process, so the cache simply expires rather than being
+# cleared on each death.
+DEATH_STATS_CACHE_TIMEOUT = 5
+# How long the merged stats of a finished world tick stay in the cache.
+STATS_HISTORY_CACHE_TIMEOUT = 60 * 60
+# How long a block of generated terrain stays in the cache. It never changes
+# for a seed, so this only bounds how many are kept. It is shorter than the
+# other timeouts, so a full SimpleCache evicts terrain first.
+TERRAIN_CACHE_TIMEOUT = 10 * 60
+# Terrain is cached in blocks of this many sampled tiles along each side.
+TERRAIN_BLOCK_SIZE = WORLD_CHUNK_SIZE
+
+# The traits generate_svg draws a critter from. They are genetic, so they
+# never change once a critter is born.
+_APPEARANCE_COLUMNS = (Critter.diet, Critter.size, Critter.speed, Critter.metabolism)
+
+# The statements the busiest routes run, built once rather than per request.
+_CRITTER_APPEARANCE = select(*_APPEARANCE_COLUMNS).where(Critter.id == bindparam("critter_id"))
+# Only the columns are loaded, so no CritterEvent objects are built.
+_CRITTER_EVENTS = (
+    select(CritterEvent.tick, CritterEvent.event, CritterEvent.description)
+    .where(CritterEvent.critter_id == bindparam("critter_id"))
+    .order_by(CritterEvent.tick.desc())
+)
+# Plain rows, streamed in batches, rather than Critter objects.
+_CRITTERS_IN_RECT = (
+    select(*Critter.__table__.columns)
+    .where(
+        Critter.x.between(bindparam("min_x"), bindparam("max_x")),
+        Critter.y.between(bindparam("min_y"), bindparam("max_y")),
+    )
+    .execution_options(yield_per=1000)
+)
+
+# How long browsers may reuse a critter image before checking its ETag.
+IMAGE_MAX_AGE = 60
+# How long a generated image stays in the cache. Critters that die are not
+# looked up again, so theirs simply expire.
+IMAGE_CACHE_TIMEOUT = 3600
+
 
 @main.route("/")
 def index():
@@ -109,8 +160,12 @@ def get_player(player_id):
 @main.route("/api/critter/<int:critter_id>", methods=["GET"])
 def get_critter(critter_id):
     """Get's a critter's data by its ID"""
-    critter = Critter.query.get_or_404(critter_id)
-    return jsonify(critter.to_dict())
+    critter = db.get_or_404(Critter, critter_id)
+    response = jsonify(critter.to_dict())
+    # Critters record no modification time, so the ETag is a hash of the
+    # body. A client polling a critter that has not changed gets a 304.
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @main.route("/api/critter/<int:critter_id>/adopt", methods=["POST"])
@@ -119,7 +174,10 @@ def adopt_critter(critter_id):
     Assigns an existing unowned critter to a player.
     Excepts a JSON body with a 'player_id'.
     """
-    critter = Critter.query.get(critter_id)
+    # The owner is loaded with the critter as it is checked right away.
+    critter = db.session.get(
+        Critter, critter_id, options=[joinedload(Critter.owner)]
+    )
     if not critter:
         return jsonify({"error": "Critter not found"}), 404
 
@@ -140,7 +198,7 @@ def adopt_critter(critter_id):
 
     player_id = data["player_id"]
 
-    player = Player.query.filter_by(id=player_id).first()
+    player = db.session.get(Player, player_id)
     if not player:
         return jsonify({"error": f"Player {player_id} does not exist"}), 404
 
@@ -159,12 +217,21 @@ def adopt_critter(critter_id):
 @main.route("/api/critter/<int:critter_id>/events", methods=["GET"])
 def get_critter_events(critter_id: int):
     """Returns the event log for a single critter, ordered by tick"""
-    events = (
-        CritterEvent.query.filter_by(critter_id=critter_id)
-        .order_by(CritterEvent.tick.desc())
-        .all()
+    events = db.session.execute(_CRITTER_EVENTS, {"critter_id": critter_id}).all()
+    return Response(
+        orjson.dumps(
+            [
+                {
+                    "critter_id": critter_id,
+                    "tick": tick,
+                    "event": event.name,
+                    "description": description,
+                }
+                for tick, event, description in events
+            ]
+        ),
+        mimetype="application/json",
     )
-    return jsonify([event.to_dict() for event in events])
 
 
 @main.route("/api/critter/<int:critter_id>/image.svg")
@@ -172,8 +239,36 @@ def get_critter_image(critter_id: int):
     """
     Return a generated SVG for a Critter
     """
-    critter = Critter.query.get_or_404(critter_id)
-    return Response(generate_svg(critter), mimetype="image/svg+xml")
+    appearance = db.session.execute(
+        _CRITTER_APPEARANCE, {"critter_id": critter_id}
+    ).first()
+    if appearance is None:
+        abort(404)
+
+    version = (
+        f"{critter_id}-{appearance.diet.value}-{appearance.size}"
+        f"-{appearance.speed}-{appearance.metabolism}"
+    )
+    # Both the plain and gzipped SVG are cached, so neither is redone.
+    key = f"critter:svg+gzip:{version}"
+    svg, svg_gzip = cache.get(key) or (None, None)
+    if svg is None:
+        svg = generate_svg(appearance).encode()
+        svg_gzip = gzip.compress(svg, mtime=0)
+        cache.set(key, (svg, svg_gzip), timeout=IMAGE_CACHE_TIMEOUT)
+
+    if "gzip" in request.accept_encodings:
+        response = Response(svg_gzip, mimetype="image/svg+xml")
+        response.content_encoding = "gzip"
+    else:
+        response = Response(svg, mimetype="image/svg+xml")
+    response.vary.add("Accept-Encoding")
+    # Weak, as the spots on a herbivore are placed at random each time its
+    # image is generated.
+    response.set_etag(version, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = IMAGE_MAX_AGE
+    return response.make_conditional(request)
 
 
 @main.route("/api/dead-critter", methods=["GET"])
@@ -199,57 +294,164 @@ def get_dead_critter():
     return jsonify(dead_critter.to_dict())
 
 
-@main.route("/api/world/terrain", methods=["GET"])
-def get_world_terrain_data():
-    """Returns tile data for a given rectangular viewing area."""
-    center_x = request.args.get("x", default=0, type=int)
-    center_y = request.args.get("y", default=0, type=int)
-    width = request.args.get("w", default=50, type=int)
-    height = request.args.get("h", default=50, type=int)
+def _view_args() -> Tuple[int, int, int, int]:
+    """The (x, y, w, h) of the view a request is for."""
+    return (
+        request.args.get("x", default=0, type=int),
+        request.args.get("y", default=0, type=int),
+        request.args.get("w", default=50, type=int),
+        request.args.get("h", default=50, type=int),
+    )
+
+
+def _sampled_terrain(
+    world: World, start_x: int, start_y: int, step: int, shape: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the heights and terrain of the `shape` (rows, columns) tiles
+    sampled every `step` tiles from (start_x, start_y).
 
+    Heights and terrain depend only on the seed, so they are shared through
+    the cache in blocks. A block holds the tiles at phase + k * step for
+    TERRAIN_BLOCK_SIZE consecutive k on each axis, so views panned or
+    resized at the same step reuse the blocks they overlap.
+    """
+    rows, columns = shape
+    heights = np.empty(shape, dtype=np.float64)
+    terrain = np.empty(shape, dtype=np.uint8)
+
+    # The index k of the first sampled tile on each axis, and the offset of
+    # the sampled grid from multiples of step.
+    first_kx, phase_x = divmod(start_x, step)
+    first_ky, phase_y = divmod(start_y, step)
+
+    blocks = [
+        (block_x, block_y)
+        for block_y in range(
+            first_ky // TERRAIN_BLOCK_SIZE, (first_ky + rows - 1) // TERRAIN_BLOCK_SIZE + 1
+        )
+        for block_x in range(
+            first_kx // TERRAIN_BLOCK_SIZE, (first_kx + columns - 1) // TERRAIN_BLOCK_SIZE + 1
+        )
+    ]
+    keys = [
+        f"terrain:{world.seed}:{step}:{phase_x}:{phase_y}:{block_x}:{block_y}"
+        for block_x, block_y in blocks
+    ]
+
+    generated = {}
+    for key, (block_x, block_y), cached in zip(keys, blocks, cache.get_many(*keys)):
+        block_kx = block_x * TERRAIN_BLOCK_SIZE
+        block_ky = block_y * TERRAIN_BLOCK_SIZE
+        if cached is None:
+            block_xs, block_ys = np.meshgrid(
+                phase_x + step * np.arange(block_kx, block_kx + TERRAIN_BLOCK_SIZE),
+                phase_y + step * np.arange(block_ky, block_ky + TERRAIN_BLOCK_SIZE),
+            )
+            cached = world.get_terrain_at(block_xs, block_ys)
+            generated[key] = cached
+        block_heights, block_terrain = cached
+
+        # The part of the view inside this block, as sample indices.
+        kx0 = max(first_kx, block_kx)
+        kx1 = min(first_kx + columns, block_kx + TERRAIN_BLOCK_SIZE)
+        ky0 = max(first_ky, block_ky)
+        ky1 = min(first_ky + rows, block_ky + TERRAIN_BLOCK_SIZE)
+
+        view = (slice(ky0 - first_ky, ky1 - first_ky), slice(kx0 - first_kx, kx1 - first_kx))
+        block = (slice(ky0 - block_ky, ky1 - block_ky), slice(kx0 - block_kx, kx1 - block_kx))
+        heights[view] = block_heights[block]
+        terrain[view] = block_terrain[block]
+
+    if generated:
+        cache.set_many(generated, timeout=TERRAIN_CACHE_TIMEOUT)
+
+    return heights, terrain
+
+
+def _terrain_data(center_x: int, center_y: int, width: int, height: int) -> Dict[str, Any]:
+    """Returns the tile data for a rectangular view."""
     world = World(seed=Config.WORLD_SEED, session=db.session)
 
-    tile_data = []
     start_x = center_x - (width // 2)
     start_y = center_y - (height // 2)
 
-    step = 1
-    if width > CANVAS_SIZE:
-        step = width // CANVAS_SIZE
-
-    for y_offset in range(0, height, step):
-        for x_offset in range(0, width, step):
-            current_x = start_x + x_offset
-            current_y = start_y + y_offset
-
-            tile = world.get_tile(current_x, current_y)
-
-            tile.terrain = tile.terrain.name
-            tile_data.append(tile)
+    # Sample every step-th tile, on both axes, to keep the payload small.
+    step = max(-(-width // MAX_TILES_PER_SIDE), -(-height // MAX_TILES_PER_SIDE))
 
-    return jsonify({"tiles": tile_data})
+    xs, ys = np.meshgrid(
+        np.arange(start_x, start_x + width, step),
+        np.arange(start_y, start_y + height, step),
+    )
 
+    heights, terrain = _sampled_terrain(world, start_x, start_y, step, xs.shape)
+    # Food changes each tick, so it is never cached.
+    food = world.get_food_at(xs, ys, terrain).ravel()
+
+    # Only the food that differs from the default for its terrain is sent.
+    default_food = np.where(terrain.ravel() == TerrainType.GRASS.value, DEFAULT_GRASS_FOOD, 0.0)
+    changed = np.flatnonzero(food != default_food)
+
+    # Each field is an array over the sampled tiles, in row-major order.
+    return {
+        "x0": start_x,
+        "y0": start_y,
+        "step": step,
+        "columns": xs.shape[1],
+        "rows": xs.shape[0],
+        "terrain": terrain.ravel(),
+        "height": heights.ravel(),
+        "food": {"index": changed, "amount": food[changed]},
+    }
 
-@main.route("/api/world/critters", methods=["GET"])
-def get_world_critters_data():
-    """Returns the critter data for a given rectangular view."""
-    center_x = request.args.get("x", default=0, type=int)
-    center_y = request.args.get("y", default=0, type=int)
-    width = request.args.get("w", default=50, type=int)
-    height = request.args.get("h", default=50, type=int)
 
+def _critters_data(
+    center_x: int, center_y: int, width: int, height: int
+) -> List[Dict[str, Any]]:
+    """Returns the critter data for a rectangular view."""
     start_x = center_x - (width // 2)
     end_x = start_x + width
     start_y = center_y - (height // 2)
     end_y = start_y + height
 
-    critters_in_view = Critter.query.filter(
-        Critter.x.between(
-            start_x, end_x - 1), Critter.y.between(start_y, end_y - 1)
-    ).all()
-    critter_data = [critter.to_dict() for critter in critters_in_view]
+    critters_in_view = db.session.execute(
+        _CRITTERS_IN_RECT,
+        {"min_x": start_x, "max_x": end_x - 1, "min_y": start_y, "max_y": end_y - 1},
+    )
+    return [Critter.row_to_dict(row._mapping) for row in critters_in_view]
+
+
+@main.route("/api/world/view", methods=["GET"])
+def get_world_view_data():
+    """
+    Returns the terrain and critters for a given rectangular view, so a
+    client drawing a new view needs just one request.
+    """
+    view = _view_args()
+    _, _, width, height = view
+
+    if not (0 < width <= MAX_VIEW_SIZE and 0 < height <= MAX_VIEW_SIZE):
+        return (
+            jsonify({"error": f"Width and height must be between 1 and {MAX_VIEW_SIZE}"}),
+            400,
+        )
+
+    return Response(
+        orjson.dumps(
+            {"terrain": _terrain_data(*view), "critters": _critters_data(*view)},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        ),
+        mimetype="application/json",
+    )
 
-    return jsonify({"critters": critter_data})
+
+@main.route("/api/world/critters", methods=["GET"])
+def get_world_critters_data():
+    """
+    Returns the critter data for a given rectangular view. Clients poll this
+    to move critters around a view they already have the terrain for.
+    """
+    return jsonify({"critters": _critters_data(*_view_args())})
 
 
 @main.route("/api/world/season", methods=["GET"])
@@ -260,6 +462,112 @@ def get_season():
     return jsonify({"name": season_name})
 
 
+def _aggregate_world_tick(
+    world_tick: int, group_stats: List[SimulationStats]
+) -> Dict[str, Any]:
+    """Merges the stats recorded during one world tick into a single entry."""
+    num_stats_in_group = len(group_stats)
+    last_stat_in_group = group_stats[-1]
+
+    distributions = {
+        "herbivore_age": Counter(), "carnivore_age": Counter(),
+        "herbivore_health": Counter(), "carnivore_health": Counter(),
+        "herbivore_hunger": Counter(), "carnivore_hunger": Counter(),
+        "herbivore_thirst": Counter(), "carnivore_thirst": Counter(),
+        "herbivore_energy": Counter(), "carnivore_energy": Counter(),
+        "goal": Counter()
+    }
+
+    for stat in group_stats:
+        distributions["herbivore_age"].update(
+            json.loads(stat.herbivore_age_distribution or '{}'))
+        distributions["carnivore_age"].update(
+            json.loads(stat.carnivore_age_distribution or '{}'))
+        distributions["herbivore_health"].update(
+            json.loads(stat.herbivore_health_distribution or '{}'))
+        distributions["carnivore_health"].update(
+            json.loads(stat.carnivore_health_distribution or '{}'))
+        distributions["herbivore_hunger"].update(
+            json.loads(stat.herbivore_hunger_distribution or '{}'))
+        distributions["carnivore_hunger"].update(
+            json.loads(stat.carnivore_hunger_distribution or '{}'))
+        distributions["herbivore_thirst"].update(
+            json.loads(stat.herbivore_thirst_distribution or '{}'))
+        distributions["carnivore_thirst"].update(
+            json.loads(stat.carnivore_thirst_distribution or '{}'))
+        distributions["herbivore_energy"].update(
+            json.loads(stat.herbivore_energy_distribution or '{}'))
+        distributions["carnivore_energy"].update(
+            json.loads(stat.carnivore_energy_distribution or '{}'))
+        distributions["goal"].update(
+            json.loads(stat.goal_distribution or '{}'))
+
+    for dist in distributions.values():
+        for key in dist:
+            dist[key] //= num_stats_in_group
+
+    aggregated_entry = {
+        "world_tick": world_tick,
+        "tick": last_stat_in_group.tick,  # Use the last tick as representative
+
+        # Take the maximum of the populations
+        "population": max(s.population for s in group_stats),
+        "herbivore_population": max(s.herbivore_population for s in group_stats),
+        "carnivore_population": max(s.carnivore_population for s in group_stats),
+
+        # Use the merged distributions
+        "herbivore_age_distribution": distributions["herbivore_age"],
+        "carnivore_age_distribution": distributions["carnivore_age"],
+        "herbivore_health_distribution": distributions["herbivore_health"],
+        "carnivore_health_distribution": distributions["carnivore_health"],
+        "herbivore_hunger_distribution": distributions["herbivore_hunger"],
+        "carnivore_hunger_distribution": distributions["carnivore_hunger"],
+        "herbivore_thirst_distribution": distributions["herbivore_thirst"],
+        "carnivore_thirst_distribution": distributions["carnivore_thirst"],
+        "herbivore_energy_distribution": distributions["herbivore_energy"],
+        "carnivore_energy_distribution": distributions["carnivore_energy"],
+        "goal_distribution": distributions["goal"],
+
+        # For quartiles, taking the last value is the most representative
+        # of the state at the end of that world tick.
+        "herbivore_speed_q1": last_stat_in_group.herbivore_speed_q1,
+        "herbivore_speed_median": last_stat_in_group.herbivore_speed_median,
+        "herbivore_speed_q3": last_stat_in_group.herbivore_speed_q3,
+        "carnivore_speed_q1": last_stat_in_group.carnivore_speed_q1,
+        "carnivore_speed_median": last_stat_in_group.carnivore_speed_median,
+        "carnivore_speed_q3": last_stat_in_group.carnivore_speed_q3,
+
+        "herbivore_size_q1": last_stat_in_group.herbivore_size_q1,
+        "herbivore_size_median": last_stat_in_group.herbivore_size_median,
+        "herbivore_size_q3": last_stat_in_group.herbivore_size_q3,
+        "carnivore_size_q1": last_stat_in_group.carnivore_size_q1,
+        "carnivore_size_median": last_stat_in_group.carnivore_size_median,
+        "carnivore_size_q3": last_stat_in_group.carnivore_size_q3,
+
+        "herbivore_metabolism_q1": last_stat_in_group.herbivore_metabolism_q1,
+        "herbivore_metabolism_median": last_stat_in_group.herbivore_metabolism_median,
+        "herbivore_metabolism_q3": last_stat_in_group.herbivore_metabolism_q3,
+        "carnivore_metabolism_q1": last_stat_in_group.carnivore_metabolism_q1,
+        "carnivore_metabolism_median": last_stat_in_group.carnivore_metabolism_median,
+        "carnivore_metabolism_q3": last_stat_in_group.carnivore_metabolism_q3,
+
+        "herbivore_perception_q1": last_stat_in_group.herbivore_perception_q1,
+        "herbivore_perception_median": last_stat_in_group.herbivore_perception_median,
+        "herbivore_perception_q3": last_stat_in_group.herbivore_perception_q3,
+        "carnivore_perception_q1": last_stat_in_group.carnivore_perception_q1,
+        "carnivore_perception_median": last_stat_in_group.carnivore_perception_median,
+        "carnivore_perception_q3": last_stat_in_group.carnivore_perception_q3,
+
+        "herbivore_commitment_q1": last_stat_in_group.herbivore_commitment_q1,
+        "herbivore_commitment_median": last_stat_in_group.herbivore_commitment_median,
+        "herbivore_commitment_q3": last_stat_in_group.herbivore_commitment_q3,
+        "carnivore_commitment_q1": last_stat_in_group.carnivore_commitment_q1,
+        "carnivore_commitment_median": last_stat_in_group.carnivore_commitment_median,
+        "carnivore_commitment_q3": last_stat_in_group.carnivore_commitment_q3,
+    }
+    return aggregated_entry
+
+
 @main.route("/api/stats/history", methods=["GET"])
 def get_stats_history():
     """Returns a history of simulation stats"""
@@ -273,127 +581,65 @@ def get_stats_history():
     history_length = 200
     start_world_tick = max(0, latest_world_tick - history_length)
 
-    stats_history = (
-        SimulationStats.query
+    # Stats are merged over each run of consecutive ticks with the same world
+    # tick. A world tick can have several runs, as world ticks go backwards
+    # when the population grows.
+    ticks = (
+        db.session.query(
+            SimulationStats.tick, SimulationStats.world_tick, SimulationStats.timestamp
+        )
         .filter(SimulationStats.world_tick.between(start_world_tick, latest_world_tick))
         .order_by(SimulationStats.tick)
         .all()
     )
+    runs = []
+    for world_tick, group in groupby(ticks, key=lambda row: row.world_tick):
+        group = list(group)
+        runs.append((world_tick, group[0].tick, group[-1].tick, group[-1].timestamp))
 
-    if not stats_history:
+    if not runs:
         return jsonify([])
 
-    aggregated_stats = []
+    # Stats are never changed once written, so a finished run always merges
+    # to the same entry. Each is cached under its first and last stats rows,
+    # so a reset history cannot be mistaken for the old one. The last run
+    # may still be getting stats, so it is always merged afresh.
+    keys = [
+        f"stats:history:{world_tick}:{first_tick}:{last_tick}:{last_timestamp}"
+        for world_tick, first_tick, last_tick, last_timestamp in runs
+    ]
+    entries = cache.get_many(*keys[:-1]) + [None]
+
+    missing = {runs[i][1]: i for i, entry in enumerate(entries) if entry is None}
+    stats_history = (
+        SimulationStats.query
+        .filter(
+            SimulationStats.world_tick.between(start_world_tick, latest_world_tick),
+            SimulationStats.tick >= min(missing),
+        )
+        .order_by(SimulationStats.tick)
+        .all()
+    )
 
+    finished = {}
     for world_tick, group in groupby(stats_history, key=lambda s: s.world_tick):
         group_stats = list(group)
-        num_stats_in_group = len(group_stats)
-        if num_stats_in_group == 0:
+        i = missing.get(group_stats[0].tick)
+        if i is None:
             continue
-        last_stat_in_group = group_stats[-1]
-
-        distributions = {
-            "herbivore_age": Counter(), "carnivore_age": Counter(),
-            "herbivore_health": Counter(), "carnivore_health": Counter(),
-            "herbivore_hunger": Counter(), "carnivore_hunger": Counter(),
-            "herbivore_thirst": Counter(), "carnivore_thirst": Counter(),
-            "herbivore_energy": Counter(), "carnivore_energy": Counter(),
-            "goal": Counter()
-        }
-
-        for stat in group_stats:
-            distributions["herbivore_age"].update(
-                json.loads(stat.herbivore_age_distribution or '{}'))
-            distributions["carnivore_age"].update(
-                json.loads(stat.carnivore_age_distribution or '{}'))
-            distributions["herbivore_health"].update(
-                json.loads(stat.herbivore_health_distribution or '{}'))
-            distributions["carnivore_health"].update(
-                json.loads(stat.carnivore_health_distribution or '{}'))
-            distributions["herbivore_hunger"].update(
-                json.loads(stat.herbivore_hunger_distribution or '{}'))
-            distributions["carnivore_hunger"].update(
-                json.loads(stat.carnivore_hunger_distribution or '{}'))
-            distributions["herbivore_thirst"].update(
-                json.loads(stat.herbivore_thirst_distribution or '{}'))
-            distributions["carnivore_thirst"].update(
-                json.loads(stat.carnivore_thirst_distribution or '{}'))
-            distributions["herbivore_energy"].update(
-                json.loads(stat.herbivore_energy_distribution or '{}'))
-            distributions["carnivore_energy"].update(
-                json.loads(stat.carnivore_energy_distribution or '{}'))
-            distributions["goal"].update(
-                json.loads(stat.goal_distribution or '{}'))
-
-        for dist in distributions.values():
-            for key in dist:
-                dist[key] //= num_stats_in_group
-
-        aggregated_entry = {
-            "world_tick": world_tick,
-            "tick": last_stat_in_group.tick,  # Use the last tick as representative
-
-            # Take the maximum of the populations
-            "population": max(s.population for s in group_stats),
-            "herbivore_population": max(s.herbivore_population for s in group_stats),
-            "carnivore_population": max(s.carnivore_population for s in group_stats),
-
-            # Use the merged distributions
-            "herbivore_age_distribution": distributions["herbivore_age"],
-            "carnivore_age_distribution": distributions["carnivore_age"],
-            "herbivore_health_distribution": distributions["herbivore_health"],
-            "carnivore_health_distribution": distributions["carnivore_health"],
-            "herbivore_hunger_distribution": distributions["herbivore_hunger"],
-            "carnivore_hunger_distribution": distributions["carnivore_hunger"],
-            "herbivore_thirst_distribution": distributions["herbivore_thirst"],
-            "carnivore_thirst_distribution": distributions["carnivore_thirst"],
-            "herbivore_energy_distribution": distributions["herbivore_energy"],
-            "carnivore_energy_distribution": distributions["carnivore_energy"],
-            "goal_distribution": distributions["goal"],
-
-            # For quartiles, taking the last value is the most representative
-            # of the state at the end of that world tick.
-            "herbivore_speed_q1": last_stat_in_group.herbivore_speed_q1,
-            "herbivore_speed_median": last_stat_in_group.herbivore_speed_median,
-            "herbivore_speed_q3": last_stat_in_group.herbivore_speed_q3,
-            "carnivore_speed_q1": last_stat_in_group.carnivore_speed_q1,
-            "carnivore_speed_median": last_stat_in_group.carnivore_speed_median,
-            "carnivore_speed_q3": last_stat_in_group.carnivore_speed_q3,
-
-            "herbivore_size_q1": last_stat_in_group.herbivore_size_q1,
-            "herbivore_size_median": last_stat_in_group.herbivore_size_median,
-            "herbivore_size_q3": last_stat_in_group.herbivore_size_q3,
-            "carnivore_size_q1": last_stat_in_group.carnivore_size_q1,
-            "carnivore_size_median": last_stat_in_group.carnivore_size_median,
-            "carnivore_size_q3": last_stat_in_group.carnivore_size_q3,
-
-            "herbivore_metabolism_q1": last_stat_in_group.herbivore_metabolism_q1,
-            "herbivore_metabolism_median": last_stat_in_group.herbivore_metabolism_median,
-            "herbivore_metabolism_q3": last_stat_in_group.herbivore_metabolism_q3,
-            "carnivore_metabolism_q1": last_stat_in_group.carnivore_metabolism_q1,
-            "carnivore_metabolism_median": last_stat_in_group.carnivore_metabolism_median,
-            "carnivore_metabolism_q3": last_stat_in_group.carnivore_metabolism_q3,
-
-            "herbivore_perception_q1": last_stat_in_group.herbivore_perception_q1,
-            "herbivore_perception_median": last_stat_in_group.herbivore_perception_median,
-            "herbivore_perception_q3": last_stat_in_group.herbivore_perception_q3,
-            "carnivore_perception_q1": last_stat_in_group.carnivore_perception_q1,
-            "carnivore_perception_median": last_stat_in_group.carnivore_perception_median,
-            "carnivore_perception_q3": last_stat_in_group.carnivore_perception_q3,
-
-            "herbivore_commitment_q1": last_stat_in_group.herbivore_commitment_q1,
-            "herbivore_commitment_median": last_stat_in_group.herbivore_commitment_median,
-            "herbivore_commitment_q3": last_stat_in_group.herbivore_commitment_q3,
-            "carnivore_commitment_q1": last_stat_in_group.carnivore_commitment_q1,
-            "carnivore_commitment_median": last_stat_in_group.carnivore_commitment_median,
-            "carnivore_commitment_q3": last_stat_in_group.carnivore_commitment_q3,
-        }
-        aggregated_stats.append(aggregated_entry)
-
-    return jsonify(aggregated_stats)
+        entries[i] = _aggregate_world_tick(world_tick, group_stats)
+        if i != len(runs) - 1:
+            finished[keys[i]] = entries[i]
+
+    if finished:
+        cache.set_many(finished, timeout=STATS_HISTORY_CACHE_TIMEOUT)
+
+    # A run is only missing if the history was reset between the queries.
+    return jsonify([entry for entry in entries if entry is not None])
 
 
 @main.route("/api/stats/deaths", methods=["GET"])
+@cache.cached(timeout=DEATH_STATS_CACHE_TIMEOUT, key_prefix="stats:deaths")
 def get_death_stats():
     """
     Returns the aggregate count for each cause of death
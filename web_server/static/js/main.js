@@ -29,6 +29,14 @@ let currentView = {
 let critterDisplayData = {};
 let selectedCritter = null;
 
+// --- Terrain ids sent by the server (must match TerrainType enum values) ---
+const TERRAIN_NAMES = {
+  1: "WATER",
+  2: "GRASS",
+  3: "DIRT",
+  4: "MOUNTAIN",
+};
+
 // --- Color Map (must match TerrainType enum names) ---
 const colorMap = {
   WATER: "#4287f5",
@@ -89,12 +97,25 @@ function interpolateColor(color1, color2, factor) {
   );
 }
 
-async function fetchTerrain(view) {
-  const apiUrl = `/api/world/terrain?x=${view.x}&y=${view.y}&w=${view.w}&h=${view.h}`;
+// Fetches the terrain and critters of a view, keeping the terrain and
+// returning the critters.
+async function fetchView(view) {
+  const apiUrl = `/api/world/view?x=${view.x}&y=${view.y}&w=${view.w}&h=${view.h}`;
 
   const response = await fetch(apiUrl);
-  if (!response.ok) throw new Error("Failed to fetch terrain");
-  currentTerrainData = await response.json();
+  if (!response.ok) throw new Error("Failed to fetch view");
+  const { terrain, critters } = await response.json();
+
+  // Only the tiles whose food differs from the default are sent.
+  terrain.foodAvailable = Float64Array.from(terrain.terrain, (id) =>
+    TERRAIN_NAMES[id] === "GRASS" ? DEFAULT_GRASS_FOOD : 0
+  );
+  terrain.food.index.forEach((tile, i) => {
+    terrain.foodAvailable[tile] = terrain.food.amount[i];
+  });
+
+  currentTerrainData = terrain;
+  return critters;
 }
 
 async function fetchCritters(view) {
@@ -106,26 +127,27 @@ async function fetchCritters(view) {
 
 function drawTerrain(view) {
   if (!currentTerrainData) return;
-  const tiles = currentTerrainData.tiles;
+  // Each tile sent stands for a step x step block of the view.
+  const { columns, step, terrain, height, foodAvailable } = currentTerrainData;
   const tileWidth = canvas.width / view.w;
   const tileHeight = canvas.height / view.h;
 
-  for (let i = 0; i < tiles.length; i++) {
-    const tile = tiles[i];
-    const x = i % view.w;
-    const y = Math.floor(i / view.w);
+  for (let i = 0; i < terrain.length; i++) {
+    const terrainName = TERRAIN_NAMES[terrain[i]];
+    const x = (i % columns) * step;
+    const y = Math.floor(i / columns) * step;
 
     let baseColor;
-    if (tile.terrain === "GRASS") {
-      const foodPercent = tile.food_available / DEFAULT_GRASS_FOOD;
+    if (terrainName === "GRASS") {
+      const foodPercent = foodAvailable[i] / DEFAULT_GRASS_FOOD;
       baseColor = interpolateColor(colorMap.DIRT, colorMap.GRASS, foodPercent);
     } else {
-      baseColor = colorMap[tile.terrain] || "#000";
+      baseColor = colorMap[terrainName] || "#000";
     }
 
-    const finalColor = shadeColor(baseColor, tile.height * 0.4);
+    const finalColor = shadeColor(baseColor, height[i] * 0.4);
     ctx.fillStyle = finalColor;
-    ctx.fillRect(x * tileWidth, y * tileHeight, tileWidth, tileHeight);
+    ctx.fillRect(x * tileWidth, y * tileHeight, step * tileWidth, step * tileHeight);
   }
 }
 
@@ -326,14 +348,12 @@ async function handleManualUpdate() {
   history.pushState({ path: newUrl }, "", newUrl);
 
   try {
-    await fetchTerrain(currentView);
+    const critters = await fetchView(currentView);
     drawTerrain(currentView);
 
-    const critterData = await fetchCritters(currentView);
-
     // Clear data on a manual update
     critterDisplayData = {};
-    for (const critter of critterData.critters) {
+    for (const critter of critters) {
       critterDisplayData[critter.id] = {
         currentX: critter.x,
         currentY: critter.y,